@@ -383,6 +383,10 @@ class BackwardPassGenerator:
         self.conflicted_gradient_buffers: Set[
             str] = conflicted_gradient_buffers or set()
 
+        #: counters for names of arrays added to the forward SDFG by backward implementations, keyed by base name
+        #: (see :func:`daceml.autodiff.utils.new_forward_name`)
+        self.name_counters: Dict[str, int] = collections.defaultdict(int)
+
         # checks if backward has already been applied
         self._applied = False
         self.zero_non_transients = zero_non_transients
@@ -1,5 +1,6 @@
 import copy
 import ctypes
+import functools
 import itertools
 from typing import List, Optional, Tuple, Dict, Union
 
@@ -10,18 +11,26 @@ from dace.frontend.common import einsum
 from dace.registry import autoregister_params
 from dace import nodes as nd, dtypes, subsets
 import dace.transformation.transformation as xf
+from dace.frontend.python.parser import DaceProgram
 
 import daceml.onnx as donnx
 from daceml.onnx.converters import clean_onnx_name
 from daceml.onnx.op_implementations import pure_implementations, \
     cudnn_implementations, CudnnBatchNormalizationTraining, setup_fake_data
 import daceml.autodiff.utils as butils
-from daceml.autodiff.base_abc import BackwardImplementation, BackwardContext, BackwardResult
+from daceml.autodiff.base_abc import BackwardImplementation, BackwardContext, BackwardResult, \
+    AutoDiffException
 from daceml.transformation.replacement import onnx_constant_or_none
 from daceml.util import utils
 import daceml
 
 
+@functools.lru_cache(maxsize=None)
+def _parse_einsum(equation: str) -> einsum.EinsumParser:
+    """ Parse an einsum equation. The parsers are cached, and must not be modified. """
+    return einsum.EinsumParser(equation)
+
+
 def reverse_einsum_wrt_input(forward_node: donnx.ONNXEinsum,
                              input_name: str) -> Tuple[List[str], str]:
     """ Produce the einsum string that computes the grad of ``forward_node`` w.r.t. ``input_name``.
@@ -37,7 +46,7 @@ def reverse_einsum_wrt_input(forward_node: donnx.ONNXEinsum,
     """
 
     _, input_idx = donnx.parse_variadic_param(input_name)
-    parser = einsum.EinsumParser(forward_node.equation)
+    parser = _parse_einsum(forward_node.equation)
 
     backward_input_expressions = [
         parser.output
@@ -51,9 +60,170 @@ def reverse_einsum_wrt_input(forward_node: donnx.ONNXEinsum,
     return backward_input_arrays, einsum_str
 
 
+def reverse_einsum_contractions(
+    forward_node: donnx.ONNXEinsum, context: BackwardContext,
+    input_names: List[str]
+) -> List[Tuple[List[str], str, str, List[dace.symbolic.SymbolicType]]]:
+    """ Produce a joint contraction schedule for the grads of ``forward_node`` w.r.t. each of ``input_names``.
+
+        Each gradient einsum (see :func:`reverse_einsum_wrt_input`) is split into pairwise contractions along the path
+        computed by ``opt_einsum``. Intermediate results that are shared between gradients (i.e. that contract the same
+        operands to the same indices) are only computed once.
+
+        If ``opt_einsum`` is not installed, or the shapes are symbolic, each gradient is computed using a single
+        einsum.
+
+        :param forward_node: the einsum node to reverse.
+        :param context: the backward context.
+        :param input_names: the connectors on the forward node to produce the gradient computations for.
+        :return: the list of contractions, in dataflow order. Each contraction is a tuple of the operand names, the
+                 einsum string, the result name and the shape of the result. Operand names are either ``"Output"``
+                 (the grad of ``Output``), connectors of the forward node, or the result names of previous
+                 contractions. The result name of the last contraction of each gradient is the name of the input;
+                 these results are never used as operands.
+    """
+
+    parser = _parse_einsum(forward_node.equation)
+    sizes = {}
+    for i, subscript in enumerate(parser.inputs):
+        desc = butils.forward_in_desc_with_name(forward_node, context,
+                                                f"Inputs__{i}")
+        sizes.update(zip(subscript, desc.shape))
+
+    try:
+        import opt_einsum
+    except ImportError:
+        opt_einsum = None
+
+    optimize = opt_einsum is not None and not any(
+        dace.symbolic.issymbolic(s) for s in sizes.values())
+
+    # maps (contracted leaf operands, result subscript) to the name of the intermediate result
+    shared_intermediates: Dict[Tuple[frozenset, str], str] = {}
+    contractions = []
+    for input_name in input_names:
+        forward_inputs, einsum_str = reverse_einsum_wrt_input(
+            forward_node, input_name)
+        subscripts, target = einsum_str.split("->")
+
+        # operands are tuples of (name, subscript, leaf operands)
+        operands = [
+            (name, subscript, frozenset([name]))
+            for name, subscript in zip(["Output"] +
+                                       forward_inputs, subscripts.split(","))
+        ]
+
+        if optimize and len(operands) > 2:
+            path, _ = opt_einsum.contract_path(
+                einsum_str,
+                *([int(sizes[c]) for c in subscript]
+                  for _, subscript, _ in operands),
+                shapes=True,
+                optimize="auto")
+        else:
+            path = [tuple(range(len(operands)))]
+
+        for pair in path:
+            contracted = [operands[i] for i in pair]
+            operands = [o for i, o in enumerate(operands) if i not in pair]
+            leaves = frozenset().union(
+                *(operand_leaves for _, _, operand_leaves in contracted))
+            contracted_names = [name for name, _, _ in contracted]
+            equation_inputs = ",".join(subscript
+                                       for _, subscript, _ in contracted)
+
+            if not operands:
+                # this is the last contraction: write out the gradient
+                contractions.append(
+                    (contracted_names, f"{equation_inputs}->{target}",
+                     input_name, [sizes[c] for c in target] or [1]))
+                break
+
+            # keep all indices that are required by the remaining operands or the gradient
+            kept = set(target).union(*(subscript
+                                       for _, subscript, _ in operands))
+            contracted_indices = set().union(
+                *(subscript for _, subscript, _ in contracted))
+            result_subscript = "".join(
+                sorted(contracted_indices.intersection(kept)))
+
+            key = (leaves, result_subscript)
+            if key not in shared_intermediates:
+                shared_intermediates[
+                    key] = f"{input_name}_intermediate_{len(shared_intermediates)}"
+                contractions.append(
+                    (contracted_names,
+                     f"{equation_inputs}->{result_subscript}",
+                     shared_intermediates[key],
+                     [sizes[c] for c in result_subscript] or [1]))
+
+            operands.append(
+                (shared_intermediates[key], result_subscript, leaves))
+
+    return contractions
+
+
+def _tensordot_contraction(
+    einsum_str: str
+) -> Optional[Tuple[str, List[Optional[List[int]]], Optional[List[int]]]]:
+    """ Rewrite a pairwise contraction that is not a (batched) matrix multiplication into one that is.
+
+        Pairwise contractions without repeated indices, and without indices that are summed over within a single
+        operand, are tensordots. These can be computed as a batched matrix multiplication once the indices of each
+        operand are grouped into batch, free and contracted indices. dace lowers einsums of that form to BLAS calls,
+        whereas other einsums are computed using maps with write-conflict resolution.
+
+        :param einsum_str: the einsum string of the contraction.
+        :return: ``None`` if the contraction is already a (batched) matrix multiplication, or if it cannot be
+                 rewritten. Otherwise, the rewritten einsum string, the permutation to apply to each operand beforehand
+                 (``None`` if no transpose is required), and the permutation to apply to the result. Permutations use
+                 the convention of the ONNX ``Transpose`` operator.
+    """
+    inputs, output = einsum_str.split("->")
+    inputs = inputs.split(",")
+    if len(inputs) != 2 or _parse_einsum(einsum_str).is_bmm():
+        return None
+
+    a, b = inputs
+    if any(len(set(s)) != len(s) for s in (a, b, output)):
+        return None
+    if set(a).symmetric_difference(b) - set(output):
+        # an index is summed over within a single operand
+        return None
+
+    batch = [c for c in output if c in a and c in b]
+    a_free = [c for c in output if c in a and c not in b]
+    b_free = [c for c in output if c in b and c not in a]
+    contracted = [c for c in a if c in b and c not in output]
+
+    def grouped(subscript: str, first: List[str], second: List[str]) -> str:
+        # the order of the two non-batch groups can be handled using strides, so keep it from the subscript
+        if first and second and subscript.index(second[0]) < subscript.index(
+                first[0]):
+            first, second = second, first
+        return "".join(batch + first + second)
+
+    new_a = grouped(a, a_free, contracted)
+    new_b = grouped(b, contracted, b_free)
+    new_output = grouped(output, a_free, b_free)
+
+    def permutation(src: str, dst: str) -> Optional[List[int]]:
+        perm = [src.index(c) for c in dst]
+        return None if perm == list(range(len(perm))) else perm
+
+    return (f"{new_a},{new_b}->{new_output}",
+            [permutation(a, new_a),
+             permutation(b, new_b)], permutation(new_output, output))
+
+
 @autoregister_params(op="Einsum", name="default")
 class DefaultEinsumBackward(BackwardImplementation):
     """ The symbolic autodiff can automatically derive matmuls, but the produced maps are more difficult to optimize.
+
+        The gradients are computed using a joint schedule of pairwise einsums, so that contractions that are shared
+        between the gradients of different inputs are only computed once
+        (see :func:`reverse_einsum_contractions`). Pairwise einsums that are tensordots are transposed so that they
+        can be computed as (batched) matrix multiplications.
     """
     @staticmethod
     def backward_can_be_applied(node: nd.Node, state: dace.SDFGState,
@@ -90,44 +260,90 @@ class DefaultEinsumBackward(BackwardImplementation):
         # maps the connector name to the accessnode
         required_forward_inputs: Dict[str, nd.AccessNode] = {}
 
-        for input_name in sorted(required_gradients):
-            # we add an einsum for each required gradient
-            forward_inputs, einsum_str = reverse_einsum_wrt_input(
-                forward_node, input_name)
+        # maps the names used in the contraction schedule to the array name and accessnode
+        arrays: Dict[str, Tuple[str, nd.AccessNode]] = {
+            "Output": (result.given_grad_names["Output"], access_output_grad)
+        }
+
+        # maps operand names and permutations to the transposed array and accessnode, so that operands that are
+        # transposed the same way for multiple contractions are only transposed once
+        transposed_arrays: Dict[Tuple[str, Tuple[int, ...]],
+                                Tuple[str, nd.AccessNode]] = {}
+
+        def add_transient(
+            shape: List[dace.symbolic.SymbolicType]
+        ) -> Tuple[str, nd.AccessNode]:
+            arr_name, _ = nsdfg.add_temp_transient(shape, output_desc.dtype)
+            return arr_name, nstate.add_access(arr_name)
+
+        def add_transpose(label: str, src: Tuple[str, nd.AccessNode],
+                          dst: Tuple[str, nd.AccessNode], perm: List[int]):
+            transpose_node = donnx.ONNXTranspose(label + "_transpose",
+                                                 perm=perm)
+            nstate.add_node(transpose_node)
+            nstate.add_edge(src[1], None, transpose_node, "data",
+                            nsdfg.make_array_memlet(src[0]))
+            nstate.add_edge(transpose_node, "transposed", dst[1], None,
+                            nsdfg.make_array_memlet(dst[0]))
+
+        for operands, einsum_str, result_name, shape in reverse_einsum_contractions(
+                forward_node, context, sorted(required_gradients)):
+
+            tensordot = _tensordot_contraction(einsum_str)
+            if tensordot is not None:
+                einsum_str, operand_perms, output_perm = tensordot
+            else:
+                operand_perms, output_perm = [None] * len(operands), None
 
-            einsum_node = donnx.ONNXEinsum(input_name + "_backward",
+            einsum_node = donnx.ONNXEinsum(result_name + "_backward",
                                            equation=einsum_str)
             nstate.add_node(einsum_node)
 
-            # the first input is always the output grad
-            einsum_node.add_in_connector(f"Inputs__0")
-            nstate.add_edge(
-                access_output_grad, None, einsum_node, "Inputs__0",
-                nsdfg.make_array_memlet(result.given_grad_names["Output"]))
-
-            # add the other inputs from forward that we need
-            for i, forward_input in enumerate(sorted(forward_inputs)):
-                connector = f"Inputs__{i + 1}"
-                einsum_node.add_in_connector(connector)
-                if forward_input not in required_forward_inputs:
-                    required_forward_inputs[
-                        forward_input] = create_access_node(forward_input)
-
-                nstate.add_edge(required_forward_inputs[forward_input], None,
-                                einsum_node, connector,
-                                nsdfg.make_array_memlet(forward_input))
-
-            # write out the gradient
-            butils.forward_in_desc_with_name(forward_node, context, input_name)
-            result.required_grad_names[
-                input_name] = butils.add_backward_desc_for_connector(
-                    nsdfg, forward_node, context, input_name, True)
-            memlet = nsdfg.make_array_memlet(
-                result.required_grad_names[input_name])
-            nstate.add_edge(
-                einsum_node, "Output",
-                nstate.add_write(result.required_grad_names[input_name]), None,
-                memlet)
+            for i, (operand, perm) in enumerate(zip(operands, operand_perms)):
+                if operand not in arrays:
+                    # this is an input from forward that we need
+                    required_forward_inputs[operand] = create_access_node(
+                        operand)
+                    arrays[operand] = (operand,
+                                       required_forward_inputs[operand])
+
+                arr_name, access = arrays[operand]
+                if perm is not None:
+                    key = (operand, tuple(perm))
+                    if key not in transposed_arrays:
+                        operand_shape = nsdfg.arrays[arr_name].shape
+                        transposed_arrays[key] = add_transient(
+                            [operand_shape[p] for p in perm])
+                        add_transpose(f"{result_name}_{operand}",
+                                      (arr_name, access),
+                                      transposed_arrays[key], perm)
+                    arr_name, access = transposed_arrays[key]
+                einsum_node.add_in_connector(f"Inputs__{i}")
+                nstate.add_edge(access, None, einsum_node, f"Inputs__{i}",
+                                nsdfg.make_array_memlet(arr_name))
+
+            if result_name in required_gradients:
+                # write out the gradient
+                arr_name = butils.add_backward_desc_for_connector(
+                    nsdfg, forward_node, context, result_name, True)
+                result.required_grad_names[result_name] = arr_name
+                access = nstate.add_write(arr_name)
+            else:
+                # this is an intermediate result that is shared between gradients
+                arr_name, access = add_transient(shape)
+                arrays[result_name] = (arr_name, access)
+
+            if output_perm is not None:
+                # compute the result in the grouped order and transpose it back
+                result_shape = nsdfg.arrays[arr_name].shape
+                untransposed = add_transient(
+                    [result_shape[p] for p in np.argsort(output_perm)])
+                add_transpose(result_name, untransposed, (arr_name, access),
+                              output_perm)
+                arr_name, access = untransposed
+
+            nstate.add_edge(einsum_node, "Output", access, None,
+                            nsdfg.make_array_memlet(arr_name))
 
         result_node = context.backward_state.add_nested_sdfg(
             nsdfg, None,
@@ -234,8 +450,100 @@ __data_grad = __output_grad * __mask * scale
         return result_node, result
 
 
+# caches the SDFGs parsed by _map_over_axis, since the same slice programs are built for every (Log)Softmax node
+_slice_sdfg_cache: Dict[Tuple, dace.SDFG] = {}
+
+# reductions over at most this many elements are unrolled
+_UNROLL_REDUCTION_THRESHOLD = 32
+
+
+def _accumulator_dtype(dtype: dace.typeclass) -> dace.typeclass:
+    """ Returns the type that reductions over values of type ``dtype`` should accumulate in. Half precision values
+        are accumulated in single precision to avoid losing accuracy over long reductions.
+    """
+    return dace.float32 if dtype == dace.float16 else dtype
+
+
+def _map_over_axis(sdfg: dace.SDFG, axis: int, program, inputs: List[str],
+                   outputs: List[str]) -> nd.NestedSDFG:
+    """ Add a state to ``sdfg`` that applies ``program`` to every 1D slice along ``axis``.
+
+        The state consists of a single map over all other axes, which contains ``program`` as a nested SDFG. This
+        allows fusing reductions over ``axis`` with the elementwise operations that consume them.
+
+        The parsed SDFG of ``program`` is cached, keyed by the slice descriptors and the values ``program`` closes
+        over, so that nodes with the same slice shape don't need to invoke the python frontend again.
+
+        :param sdfg: the SDFG to add the state to.
+        :param axis: the axis to slice along.
+        :param program: the program to apply. Its parameters should be named after arrays in ``sdfg``; each will be
+                        passed as a 1D array containing the slice along ``axis``.
+        :param inputs: the arrays in ``sdfg`` that ``program`` reads.
+        :param outputs: the arrays in ``sdfg`` that ``program`` writes.
+        :return: the nested SDFG node for ``program``.
+    """
+    shape = sdfg.arrays[inputs[0]].shape
+    axis = axis % len(shape)
+
+    key = (program.__qualname__, shape[axis],
+           tuple((name, sdfg.arrays[name].dtype,
+                  sdfg.arrays[name].strides[axis], sdfg.arrays[name].storage)
+                 for name in inputs + outputs),
+           tuple(c.cell_contents for c in program.__closure__ or ()))
+    if key not in _slice_sdfg_cache:
+        program.__annotations__ = {
+            name: dace.data.Array(sdfg.arrays[name].dtype, [shape[axis]],
+                                  strides=[sdfg.arrays[name].strides[axis]],
+                                  storage=sdfg.arrays[name].storage)
+            for name in inputs + outputs
+        }
+        _slice_sdfg_cache[key] = DaceProgram(program, (), {}, False,
+                                             dace.DeviceType.CPU).to_sdfg()
+    inner_sdfg = copy.deepcopy(_slice_sdfg_cache[key])
+
+    state = sdfg.add_state()
+    inner_node = state.add_nested_sdfg(inner_sdfg, sdfg, set(inputs),
+                                       set(outputs))
+
+    map_ranges = {f"i{i}": f"0:{s}" for i, s in enumerate(shape) if i != axis}
+    index_str = ", ".join(f"0:{s}" if i == axis else f"i{i}"
+                          for i, s in enumerate(shape))
+    if map_ranges:
+        map_entry, map_exit = state.add_map(program.__name__ + "_map",
+                                            map_ranges)
+        entry_path, exit_path = [map_entry], [map_exit]
+    else:
+        entry_path, exit_path = [], []
+
+    for name in inputs:
+        state.add_memlet_path(state.add_read(name),
+                              *entry_path,
+                              inner_node,
+                              dst_conn=name,
+                              memlet=dace.Memlet(f"{name}[{index_str}]"))
+    for name in outputs:
+        state.add_memlet_path(inner_node,
+                              *exit_path,
+                              state.add_write(name),
+                              src_conn=name,
+                              memlet=dace.Memlet(f"{name}[{index_str}]"))
+
+    return inner_node
+
+
 @autoregister_params(op="Softmax", name="default")
 class DefaultSoftmaxBackward(BackwardImplementation):
+    """ Computes ``input_grad = output * (output_grad - sum(output * output_grad))``.
+
+        The reduction and the elementwise computation are fused into a single map over the non-reduced axes, so
+        ``output`` and ``output_grad`` are only read twice, and no full-size temporaries are required. For half
+        precision tensors, the reduction is accumulated in single precision.
+
+        If ``recompute`` is set, ``output`` is not forwarded from the forward pass. Instead, it is recomputed from
+        ``input`` inside the fused map, which saves keeping the output alive until the backward pass.
+    """
+    recompute = False
+
     @staticmethod
     def backward(
         forward_node: nd.Node, context: BackwardContext,
@@ -243,34 +551,89 @@ class DefaultSoftmaxBackward(BackwardImplementation):
         required_gradients: List[Optional[str]]
     ) -> Tuple[Union[nd.Node, dace.SDFG], BackwardResult]:
 
-        dim = forward_node.axis
-
-        output_shape = butils.forward_out_desc_with_name(
-            forward_node, context, "output").shape
-        output_dtype = butils.forward_out_desc_with_name(
-            forward_node, context, "output").dtype
+        saved = "input" if DefaultSoftmaxBackward.recompute else "output"
+        result_node, result = butils.add_empty_sdfg_for_node(
+            forward_node, [saved, "output_grad", "input_grad"], context)
 
-        sums_shape = list(copy.deepcopy(output_shape))
-        sums_shape[dim] = 1
+        dtype = result_node.sdfg.arrays[saved].dtype
+        acc_dtype = _accumulator_dtype(dtype)
+        N = result_node.sdfg.arrays[saved].shape[forward_node.axis]
 
         def softmax_backward(output, output_grad, input_grad):
-            prod = dace.define_local(output_shape, output_dtype)
-            sums = dace.define_local(sums_shape, output_dtype)
-            donnx.ONNXMul(A=output, B=output_grad, C=prod)
-            donnx.ONNXReduceSum(data=prod,
-                                reduced=sums,
-                                keepdims=1,
-                                axes=[dim])
-
-            donnx.ONNXMul(A=output, B=sums, C=input_grad)
-            # let's not use ONNXSub here; not sure how this inplace op is handled by ORT...
-            input_grad[:] = prod - input_grad
+            s = dace.define_local([1], acc_dtype)
+            with dace.tasklet:
+                init >> s[0]
+                init = 0
 
-        result_node, result = butils.backward_program_for_node(
-            softmax_backward, context, forward_node)
+            for j in dace.map[0:N]:
+                with dace.tasklet:
+                    o << output[j]
+                    og << output_grad[j]
+                    prod >> s(1, lambda a, b: a + b)[0]
+                    prod = acc_dtype(o) * acc_dtype(og)
 
-        butils.connect_output_from_forward(forward_node, result_node, context,
-                                           "output")
+            for k in dace.map[0:N]:
+                with dace.tasklet:
+                    o << output[k]
+                    og << output_grad[k]
+                    sums << s[0]
+                    ig >> input_grad[k]
+                    ig = acc_dtype(o) * (acc_dtype(og) - sums)
+
+        def softmax_backward_recompute(input, output_grad, input_grad):
+            m = dace.define_local([1], dtype)
+            z = dace.define_local([1], acc_dtype)
+            s = dace.define_local([1], acc_dtype)
+            with dace.tasklet:
+                x << input[0]
+                init_m >> m[0]
+                init_z >> z[0]
+                init_s >> s[0]
+                init_m = x
+                init_z = 0
+                init_s = 0
+
+            for j in dace.map[0:N]:
+                with dace.tasklet:
+                    x << input[j]
+                    max_x >> m(1, lambda a, b: max(a, b))[0]
+                    max_x = x
+
+            # z is the softmax denominator, s is sum(output * output_grad) scaled by z
+            for l in dace.map[0:N]:
+                with dace.tasklet:
+                    x << input[l]
+                    og << output_grad[l]
+                    max_x << m[0]
+                    exp_x >> z(1, lambda a, b: a + b)[0]
+                    prod >> s(1, lambda a, b: a + b)[0]
+                    e = dace.math.exp(acc_dtype(x - max_x))
+                    exp_x = e
+                    prod = e * acc_dtype(og)
+
+            for k in dace.map[0:N]:
+                with dace.tasklet:
+                    x << input[k]
+                    og << output_grad[k]
+                    max_x << m[0]
+                    denom << z[0]
+                    sums << s[0]
+                    ig >> input_grad[k]
+                    ig = dace.math.exp(acc_dtype(x - max_x)) / denom * (
+                        acc_dtype(og) - sums / denom)
+
+        if DefaultSoftmaxBackward.recompute:
+            inner_node = _map_over_axis(result_node.sdfg, forward_node.axis,
+                                        softmax_backward_recompute,
+                                        ["input", "output_grad"],
+                                        ["input_grad"])
+            _schedule_reduction_map(inner_node.sdfg, 'l', N)
+        else:
+            inner_node = _map_over_axis(result_node.sdfg, forward_node.axis,
+                                        softmax_backward,
+                                        ["output", "output_grad"],
+                                        ["input_grad"])
+        _schedule_reduction_map(inner_node.sdfg, 'j', N)
 
         return result_node, result
 
@@ -281,6 +644,17 @@ def _find_map_by_param(sdfg: dace.SDFG, pname: str) -> dace.nodes.MapEntry:
                 if isinstance(n, dace.nodes.MapEntry) and pname in n.params)
 
 
+def _schedule_reduction_map(sdfg: dace.SDFG, pname: str,
+                            size: dace.symbolic.SymbolicType):
+    """ Schedules the reduction map with the given parameter name sequentially, and unrolls it if ``size`` is a small
+        constant.
+    """
+    map_entry = _find_map_by_param(sdfg, pname)
+    map_entry.schedule = dace.ScheduleType.Sequential
+    map_entry.map.unroll = (not dace.symbolic.issymbolic(size)
+                            and size <= _UNROLL_REDUCTION_THRESHOLD)
+
+
 @autoregister_params(op="MaxPool", name="default")
 class DefaultMaxPoolBackward(BackwardImplementation):
     @staticmethod
@@ -336,6 +710,16 @@ class DefaultMaxPoolBackward(BackwardImplementation):
 
 @autoregister_params(op="LogSoftmax", name="default")
 class DefaultLogSoftmaxBackward(BackwardImplementation):
+    """ Computes ``input_grad = output_grad - exp(output) * sum(output_grad)``.
+
+        Like :class:`DefaultSoftmaxBackward`, the reduction and the elementwise computation are fused into a single
+        map over the non-reduced axes, and ``exp(output)`` is computed inline instead of being stored. For half
+        precision tensors, the reduction is accumulated in single precision.
+
+        If ``recompute`` is set, ``exp(output)`` is recomputed from ``input`` instead of forwarding ``output``.
+    """
+    recompute = False
+
     @staticmethod
     def backward(
         forward_node: nd.Node, context: BackwardContext,
@@ -343,36 +727,294 @@ class DefaultLogSoftmaxBackward(BackwardImplementation):
         required_gradients: List[Optional[str]]
     ) -> Tuple[nd.Node, BackwardResult]:
 
-        dim = forward_node.axis
-        output_shape = butils.forward_out_desc_with_name(
-            forward_node, context, "output").shape
-        output_dtype = butils.forward_out_desc_with_name(
-            forward_node, context, "output").dtype
+        saved = "input" if DefaultLogSoftmaxBackward.recompute else "output"
+        result_node, result = butils.add_empty_sdfg_for_node(
+            forward_node, [saved, "output_grad", "input_grad"], context)
 
-        sums_shape = list(copy.deepcopy(output_shape))
-        sums_shape[dim] = 1
+        dtype = result_node.sdfg.arrays[saved].dtype
+        acc_dtype = _accumulator_dtype(dtype)
+        N = result_node.sdfg.arrays[saved].shape[forward_node.axis]
 
         def logsoftmax_backward(output, output_grad, input_grad):
-            exp_output = dace.define_local(output_shape, output_dtype)
-            donnx.ONNXExp(input=output, output=exp_output)
-
-            grad_output_sum = dace.define_local(sums_shape, output_dtype)
-            donnx.ONNXReduceSum(data=output_grad,
-                                reduced=grad_output_sum,
-                                keepdims=1,
-                                axes=[dim])
-            # let's not use ONNXMul here; not sure how this inplace op is handled by ORT...
-            exp_output[:] = exp_output * grad_output_sum
-            donnx.ONNXSub(A=output_grad, B=exp_output, C=input_grad)
+            s = dace.define_local([1], acc_dtype)
+            with dace.tasklet:
+                init >> s[0]
+                init = 0
 
-        result_node, result = butils.backward_program_for_node(
-            logsoftmax_backward, context, forward_node)
+            for j in dace.map[0:N]:
+                with dace.tasklet:
+                    og << output_grad[j]
+                    sum_og >> s(1, lambda a, b: a + b)[0]
+                    sum_og = acc_dtype(og)
+
+            for k in dace.map[0:N]:
+                with dace.tasklet:
+                    o << output[k]
+                    og << output_grad[k]
+                    sums << s[0]
+                    ig >> input_grad[k]
+                    ig = acc_dtype(og) - dace.math.exp(acc_dtype(o)) * sums
+
+        def logsoftmax_backward_recompute(input, output_grad, input_grad):
+            m = dace.define_local([1], dtype)
+            z = dace.define_local([1], acc_dtype)
+            s = dace.define_local([1], acc_dtype)
+            with dace.tasklet:
+                x << input[0]
+                init_m >> m[0]
+                init_z >> z[0]
+                init_s >> s[0]
+                init_m = x
+                init_z = 0
+                init_s = 0
+
+            for j in dace.map[0:N]:
+                with dace.tasklet:
+                    x << input[j]
+                    max_x >> m(1, lambda a, b: max(a, b))[0]
+                    max_x = x
+
+            for l in dace.map[0:N]:
+                with dace.tasklet:
+                    x << input[l]
+                    og << output_grad[l]
+                    max_x << m[0]
+                    exp_x >> z(1, lambda a, b: a + b)[0]
+                    sum_og >> s(1, lambda a, b: a + b)[0]
+                    exp_x = dace.math.exp(acc_dtype(x - max_x))
+                    sum_og = acc_dtype(og)
+
+            for k in dace.map[0:N]:
+                with dace.tasklet:
+                    x << input[k]
+                    og << output_grad[k]
+                    max_x << m[0]
+                    denom << z[0]
+                    sums << s[0]
+                    ig >> input_grad[k]
+                    ig = acc_dtype(og) - dace.math.exp(
+                        acc_dtype(x - max_x)) / denom * sums
+
+        if DefaultLogSoftmaxBackward.recompute:
+            inner_node = _map_over_axis(result_node.sdfg, forward_node.axis,
+                                        logsoftmax_backward_recompute,
+                                        ["input", "output_grad"],
+                                        ["input_grad"])
+            _schedule_reduction_map(inner_node.sdfg, 'l', N)
+        else:
+            inner_node = _map_over_axis(result_node.sdfg, forward_node.axis,
+                                        logsoftmax_backward,
+                                        ["output", "output_grad"],
+                                        ["input_grad"])
+        _schedule_reduction_map(inner_node.sdfg, 'j', N)
 
-        butils.connect_output_from_forward(forward_node, result_node, context,
-                                           "output")
         return result_node, result
 
 
+def _cudnn_softmax_backward_can_be_applied(node: nd.Node,
+                                           state: dace.SDFGState,
+                                           sdfg: dace.SDFG) -> bool:
+    """ Check whether the (Log)Softmax ``node`` can be differentiated using ``cudnnSoftmaxBackward``. """
+    for desc in [
+            utils.in_desc_with_name(node, state, sdfg, "input"),
+            utils.out_desc_with_name(node, state, sdfg, "output")
+    ]:
+        if desc.storage != dtypes.StorageType.GPU_Global:
+            return False
+        if desc.dtype not in cudnn_implementations._DACE_DTYPE_TO_CUDNN_DTYPE:
+            return False
+        # the tensor is viewed as a contiguous NCHW tensor
+        contiguous_strides = [
+            cudnn_implementations._prod(desc.shape[i + 1:])
+            for i in range(len(desc.shape))
+        ]
+        if not utils.all_equal(desc.strides, contiguous_strides):
+            return False
+    return True
+
+
+def _cudnn_softmax_backward(forward_node: nd.Node, context: BackwardContext,
+                            algorithm: str) -> Tuple[nd.Node, BackwardResult]:
+    """ Differentiate a (Log)Softmax node using ``cudnnSoftmaxBackward``.
+
+        :param forward_node: the (Log)Softmax node.
+        :param context: the backward context.
+        :param algorithm: the ``cudnnSoftmaxAlgorithm_t`` to use.
+        :return: the backward node and the backward result.
+    """
+
+    result_node, result = butils.add_empty_sdfg_for_node(
+        forward_node, ["output", "output_grad", "input_grad"], context)
+    nsdfg = result_node.sdfg
+    nstate = nsdfg.add_state()
+
+    desc = nsdfg.arrays["output"]
+    T = desc.dtype
+    axis = forward_node.axis % len(desc.shape)
+
+    unique_id = "{}_{}_{}_{}_bwd".format(
+        clean_onnx_name(forward_node.name), context.forward_sdfg.sdfg_id,
+        context.forward_sdfg.node_id(context.forward_state),
+        context.forward_state.node_id(forward_node))
+
+    # view the tensors as NCHW tensors with the softmax axis as the channels. CUDNN_SOFTMAX_MODE_CHANNEL then computes
+    # the softmax over the axis. All three tensors have the same shape, so they can share a descriptor.
+    shape = [
+        cudnn_implementations._prod(desc.shape[:axis]), desc.shape[axis],
+        cudnn_implementations._prod(desc.shape[axis + 1:]), 1
+    ]
+    init_code, finalize_code = cudnn_implementations._cudnn_tensor_descriptor_code(
+        desc, f"{unique_id}_desc", False, shape=shape, layout="NCHW")
+
+    # cuDNN requires double scaling factors for double tensors
+    scaling_type = "double" if T == dace.float64 else "float"
+    tasklet_code = f"""
+    {donnx.environments.cuDNN.handle_setup_code(forward_node)}
+    {scaling_type} alpha = 1;
+    {scaling_type} beta = 0;
+    daceml::cudnn::CheckCudnnError(cudnnSoftmaxBackward(
+        __dace_cudnn_handle,
+        {algorithm},
+        CUDNN_SOFTMAX_MODE_CHANNEL,
+        &alpha,
+        *__state->{unique_id}_desc,
+        _output,
+        *__state->{unique_id}_desc,
+        _output_grad,
+        &beta,
+        *__state->{unique_id}_desc,
+        _input_grad));
+    """
+
+    tasklet = nstate.add_tasklet(
+        unique_id, {
+            "_output": dace.pointer(T),
+            "_output_grad": dace.pointer(T)
+        }, {"_input_grad": dace.pointer(T)},
+        tasklet_code,
+        dace.dtypes.Language.CPP,
+        code_init="{\n" + init_code + "\n}",
+        code_exit="{\n" + finalize_code + "\n}",
+        state_fields=[f"cudnnTensorDescriptor_t *{unique_id}_desc;"])
+    tasklet.environments = {donnx.environments.cuDNN.full_class_path()}
+
+    butils.wire_tasklet(nstate, tasklet, [("output", "_output"),
+                                          ("output_grad", "_output_grad")],
+                        [("input_grad", "_input_grad")])
+
+    return result_node, result
+
+
+@autoregister_params(op="Softmax", name="cuDNN")
+class CuDNNSoftmaxBackward(BackwardImplementation):
+    """ Softmax backward using ``cudnnSoftmaxBackward``. """
+    @staticmethod
+    def backward_can_be_applied(node: nd.Node, state: dace.SDFGState,
+                                sdfg: dace.SDFG) -> bool:
+        return _cudnn_softmax_backward_can_be_applied(node, state, sdfg)
+
+    @staticmethod
+    def backward(
+        forward_node: nd.Node, context: BackwardContext,
+        given_gradients: List[Optional[str]],
+        required_gradients: List[Optional[str]]
+    ) -> Tuple[nd.Node, BackwardResult]:
+        return _cudnn_softmax_backward(forward_node, context,
+                                       "CUDNN_SOFTMAX_ACCURATE")
+
+
+@autoregister_params(op="LogSoftmax", name="cuDNN")
+class CuDNNLogSoftmaxBackward(BackwardImplementation):
+    """ LogSoftmax backward using ``cudnnSoftmaxBackward``. """
+    @staticmethod
+    def backward_can_be_applied(node: nd.Node, state: dace.SDFGState,
+                                sdfg: dace.SDFG) -> bool:
+        return _cudnn_softmax_backward_can_be_applied(node, state, sdfg)
+
+    @staticmethod
+    def backward(
+        forward_node: nd.Node, context: BackwardContext,
+        given_gradients: List[Optional[str]],
+        required_gradients: List[Optional[str]]
+    ) -> Tuple[nd.Node, BackwardResult]:
+        return _cudnn_softmax_backward(forward_node, context,
+                                       "CUDNN_SOFTMAX_LOG")
+
+
+def _cuda_graph_code(unique_id: str, arguments: List[str],
+                     calls: str) -> Tuple[str, str, str, List[str]]:
+    """ Wrap the (cuDNN) calls issued by a tasklet in a CUDA graph.
+
+        The graph is captured the first time the tasklet is executed, and replayed on subsequent executions. It is
+        recaptured whenever one of ``arguments`` differs from the value it was captured with. If the current stream is
+        the legacy default stream, which cannot be captured, the calls are issued directly. The same happens if
+        capturing or launching the graph fails; in that case, no further captures are attempted.
+
+        :param unique_id: the unique id of the tasklet.
+        :param arguments: C++ expressions for all pointers and values used by ``calls`` that may change between
+                          executions.
+        :param calls: the code issuing the calls. It must be capturable, i.e. it may not allocate or synchronize.
+        :return: the tasklet code, init code, finalize code and state fields.
+    """
+    tasklet_code = f"""
+        auto __dace_graph_calls = [&]() {{
+            {calls}
+        }};
+        if (__dace_current_stream == nullptr || __state->{unique_id}_graph_failed) {{
+            __dace_graph_calls();
+        }} else {{
+            uintptr_t __dace_graph_args[] = {{ {", ".join(f"(uintptr_t){a}" for a in arguments)} }};
+            bool __dace_graph_stale = __state->{unique_id}_graph_exec == nullptr;
+            for (int i = 0; i < {len(arguments)}; ++i) {{
+                __dace_graph_stale |= __state->{unique_id}_graph_args[i] != __dace_graph_args[i];
+                __state->{unique_id}_graph_args[i] = __dace_graph_args[i];
+            }}
+            if (__dace_graph_stale) {{
+                if (__state->{unique_id}_graph_exec != nullptr) {{
+                    cudaGraphExecDestroy(__state->{unique_id}_graph_exec);
+                    __state->{unique_id}_graph_exec = nullptr;
+                }}
+                cudaGraph_t __dace_graph = nullptr;
+                if (cudaStreamBeginCapture(__dace_current_stream, cudaStreamCaptureModeThreadLocal) == cudaSuccess) {{
+                    __dace_graph_calls();
+                    if (cudaStreamEndCapture(__dace_current_stream, &__dace_graph) == cudaSuccess
+                        && __dace_graph != nullptr
+                        && cudaGraphInstantiate(&__state->{unique_id}_graph_exec, __dace_graph, nullptr, nullptr, 0)
+                           != cudaSuccess) {{
+                        __state->{unique_id}_graph_exec = nullptr;
+                    }}
+                    if (__dace_graph != nullptr) {{
+                        cudaGraphDestroy(__dace_graph);
+                    }}
+                }}
+            }}
+            if (__state->{unique_id}_graph_exec == nullptr
+                || cudaGraphLaunch(__state->{unique_id}_graph_exec, __dace_current_stream) != cudaSuccess) {{
+                // the calls could not be captured or replayed: clear the error and issue them directly from now on
+                cudaGetLastError();
+                std::cout << "Warning: CUDA graph capture failed for {unique_id}, issuing calls directly." << std::endl;
+                __state->{unique_id}_graph_failed = true;
+                __dace_graph_calls();
+            }}
+        }}
+    """
+    init_code = f"""
+        __state->{unique_id}_graph_exec = nullptr;
+        __state->{unique_id}_graph_failed = false;
+    """
+    finalize_code = f"""
+        if (__state->{unique_id}_graph_exec != nullptr) {{
+            cudaGraphExecDestroy(__state->{unique_id}_graph_exec);
+        }}
+    """
+    state_fields = [
+        f"cudaGraphExec_t {unique_id}_graph_exec;",
+        f"bool {unique_id}_graph_failed;",
+        f"uintptr_t {unique_id}_graph_args[{len(arguments)}];"
+    ]
+    return tasklet_code, init_code, finalize_code, state_fields
+
+
 @autoregister_params(op="Conv", name="cuDNN")
 class CuDNNConvBackward(BackwardImplementation):
     """ Conv backward using CUDNN.
@@ -393,9 +1035,15 @@ class CuDNNConvBackward(BackwardImplementation):
             "fft_tiling"
             "3"
             "winograd_nonfused"
+
+        Like the forward pass, the math type is chosen using ``CudnnConvolution.allow_tensor_op_conversion``.
+
+        If ``use_cuda_graph`` is set, the cuDNN calls are captured in a CUDA graph which is replayed on subsequent
+        calls.
     """
     default_data_algorithm = "auto"
     default_filter_algorithm = "auto"
+    use_cuda_graph = False
 
     @staticmethod
     def backward_can_be_applied(node: nd.Node, state: dace.SDFGState,
@@ -431,8 +1079,8 @@ class CuDNNConvBackward(BackwardImplementation):
         # setup non-gradient arrays
         required_forward_inputs = ["W", "X"]
         for i in sorted(required_forward_inputs):
-            new_desc = copy.deepcopy(
-                butils.forward_in_desc_with_name(forward_node, context, i))
+            new_desc = butils.forward_in_desc_with_name(
+                forward_node, context, i).clone()
             new_desc.transient = False
             nsdfg.add_datadesc(i, new_desc)
 
@@ -443,8 +1091,8 @@ class CuDNNConvBackward(BackwardImplementation):
             context.forward_sdfg.node_id(context.forward_state),
             context.forward_state.node_id(forward_node))
 
-        init_code = ""
-        finalize_code = ""
+        init_parts: List[str] = []
+        finalize_parts: List[str] = []
 
         #######################
         # add descriptor init code for gradients
@@ -463,22 +1111,22 @@ class CuDNNConvBackward(BackwardImplementation):
                 f"{unique_id}_d{r}_desc",
                 is_filter,
                 shape=shape)
-            init_code += init
-            finalize_code += exit
+            init_parts.append(init)
+            finalize_parts.append(exit)
 
         for r in sorted(required_forward_inputs):
             desc = butils.forward_in_desc_with_name(forward_node, context, r)
             is_filter = r == "W"
             init, exit = cudnn_implementations._cudnn_tensor_descriptor_code(
                 desc, f"{unique_id}_{r}_desc", is_filter)
-            init_code += init
-            finalize_code += exit
+            init_parts.append(init)
+            finalize_parts.append(exit)
 
         init, exit = cudnn_implementations._cudnn_tensor_descriptor_code(
             nsdfg.arrays[result.given_grad_names["Y"]], f"{unique_id}_dY_desc",
             False)
-        init_code += init
-        finalize_code += exit
+        init_parts.append(init)
+        finalize_parts.append(exit)
 
         #######################
         # setup conv descriptor
@@ -491,7 +1139,7 @@ class CuDNNConvBackward(BackwardImplementation):
             pad_h, pad_w = forward_node.pads[0], forward_node.pads[1]
             stride_h, stride_w = forward_node.strides
             dilation_h, dilation_w = forward_node.dilations
-        init_code += f"""
+        init_parts.append(f"""
         __state->{unique_id}_conv_desc = new cudnnConvolutionDescriptor_t; 
         daceml::cudnn::CheckCudnnError(cudnnCreateConvolutionDescriptor(__state->{unique_id}_conv_desc));
         daceml::cudnn::CheckCudnnError(cudnnSetConvolution2dDescriptor(
@@ -504,18 +1152,21 @@ class CuDNNConvBackward(BackwardImplementation):
             {dilation_w},
             CUDNN_CROSS_CORRELATION,
             {cudnn_implementations._DACE_DTYPE_TO_CUDNN_DTYPE[T]}));
-        """
+        daceml::cudnn::CheckCudnnError(cudnnSetConvolutionMathType(
+            *__state->{unique_id}_conv_desc,
+            {cudnn_implementations._cudnn_conv_math_type(T, cudnn_implementations.CudnnConvolution.allow_tensor_op_conversion)}));
+        """)
         if forward_node.group != 1:
-            init_code += f"""
+            init_parts.append(f"""
             daceml::cudnn::CheckCudnnError(cudnnSetConvolutionGroupCount(
                 *__state->{unique_id}_conv_desc,
                 {forward_node.group}
                 ));
-            """
-        finalize_code += f"""
+            """)
+        finalize_parts.append(f"""
         daceml::cudnn::CheckCudnnError(cudnnDestroyConvolutionDescriptor(*__state->{unique_id}_conv_desc));
         delete __state->{unique_id}_conv_desc;
-        """
+        """)
 
         #######################
         # setup algorithms
@@ -530,7 +1181,9 @@ class CuDNNConvBackward(BackwardImplementation):
         else:
             filter_algo = CuDNNConvBackward.default_filter_algorithm
 
-        init_code += f"{donnx.environments.cuDNN.handle_setup_code(forward_node, init_stream=False)}"
+        init_parts.append(
+            donnx.environments.cuDNN.handle_setup_code(forward_node,
+                                                       init_stream=False))
         if data_algo == "auto" or filter_algo == "auto":
             # setup fake data
             free_fake_data_code, fake_data_init_code = setup_fake_data(
@@ -538,17 +1191,17 @@ class CuDNNConvBackward(BackwardImplementation):
                 True)
 
             # setup algo
-            init_code += f"""
+            init_parts.append(f"""
             // setup fake data
             {fake_data_init_code}
 
             // setup workspace
             void *search_ws; 
             cudaMalloc(&search_ws, {cudnn_implementations.CudnnConvolution.search_ws_size});
-            """
+            """)
 
         if filter_algo == "auto":
-            init_code += f"""
+            init_parts.append(f"""
             // run search
             cudnnConvolutionBwdFilterAlgoPerf_t filter_results;
             int filter_algo_count = 1;
@@ -570,15 +1223,15 @@ class CuDNNConvBackward(BackwardImplementation):
             __state->{unique_id}_filter_algo = new cudnnConvolutionBwdFilterAlgo_t;
             *__state->{unique_id}_filter_algo = filter_results.algo;
             printf("{unique_id} using filter algo %d\\n", *__state->{unique_id}_filter_algo);
-            """
+            """)
         else:
-            init_code += f"""
+            init_parts.append(f"""
             __state->{unique_id}_filter_algo = new cudnnConvolutionBwdFilterAlgo_t;
             *__state->{unique_id}_filter_algo = CUDNN_CONVOLUTION_BWD_FILTER_ALGO_{filter_algo.upper()};
-            """
+            """)
 
         if data_algo == "auto":
-            init_code += f"""
+            init_parts.append(f"""
             // run search
             cudnnConvolutionBwdDataAlgoPerf_t data_results;
             int data_algo_count = 1;
@@ -600,28 +1253,27 @@ class CuDNNConvBackward(BackwardImplementation):
             __state->{unique_id}_data_algo = new cudnnConvolutionBwdDataAlgo_t;
             *__state->{unique_id}_data_algo = data_results.algo;
             printf("{unique_id} using data algo %d\\n", *__state->{unique_id}_data_algo);
-            """
+            """)
         else:
-            init_code += f"""
+            init_parts.append(f"""
             __state->{unique_id}_data_algo = new cudnnConvolutionBwdDataAlgo_t;
             *__state->{unique_id}_data_algo = CUDNN_CONVOLUTION_BWD_DATA_ALGO_{data_algo.upper()};
-            """
+            """)
 
         if data_algo == "auto" or filter_algo == "auto":
-            init_code += f"""
+            init_parts.append(f"""
             cudaFree(search_ws);
             {free_fake_data_code}
-            """
+            """)
 
-        finalize_code += f"""
+        finalize_parts.append(f"""
              delete __state->{unique_id}_data_algo;
              delete __state->{unique_id}_filter_algo;
-        """
+        """)
 
         #######################
         # setup workspace
-        init_code += \
-            f"""
+        init_parts.append(f"""
         // Setup workspace for {unique_id}
         
         size_t data_ws_size;
@@ -644,20 +1296,13 @@ class CuDNNConvBackward(BackwardImplementation):
             &filter_ws_size));
         
         size_t ws_size = max(filter_ws_size, data_ws_size);
-        __state->{unique_id}_workspace_size = new size_t;
-        *__state->{unique_id}_workspace_size = ws_size;
-        cudaMalloc(&__state->{unique_id}_workspace, ws_size);
-        """
-        finalize_code += f"""
-        cudaFree(__state->{unique_id}_workspace);
-        delete __state->{unique_id}_workspace_size;
-        """
+        __state->cudnn_workspace->Reserve(ws_size);
+        """)
 
         #######################
         # tasklet code
 
-        tasklet_code = f"""
-        {donnx.environments.cuDNN.handle_setup_code(forward_node)}
+        calls = f"""
         float alpha = 1.f;
         float beta = 0.f;
         daceml::cudnn::CheckCudnnError(cudnnConvolutionBackwardData(
@@ -669,8 +1314,8 @@ class CuDNNConvBackward(BackwardImplementation):
             _dY,
             *__state->{unique_id}_conv_desc,
             *__state->{unique_id}_data_algo,
-            __state->{unique_id}_workspace,
-            *__state->{unique_id}_workspace_size,
+            __dace_cudnn_workspace,
+            __state->cudnn_workspace->Size(),
             &beta,
             *__state->{unique_id}_dX_desc,
             _dX));
@@ -683,15 +1328,15 @@ class CuDNNConvBackward(BackwardImplementation):
             _dY,
             *__state->{unique_id}_conv_desc,
             *__state->{unique_id}_filter_algo,
-            __state->{unique_id}_workspace,
-            *__state->{unique_id}_workspace_size,
+            __dace_cudnn_workspace,
+            __state->cudnn_workspace->Size(),
             &beta,
             *__state->{unique_id}_dW_desc,
             _dW));
         """
 
         if "B" in required_gradients:
-            tasklet_code += f"""
+            calls += f"""
             daceml::cudnn::CheckCudnnError(cudnnConvolutionBackwardBias(
                 __dace_cudnn_handle,
                 &alpha,
@@ -702,8 +1347,26 @@ class CuDNNConvBackward(BackwardImplementation):
                 _dB));
             """
 
-        init_code = "{\n" + init_code + "\n}"
-        finalize_code = "{\n" + finalize_code + "\n}"
+        graph_state_fields = []
+        if CuDNNConvBackward.use_cuda_graph:
+            arguments = [
+                f"_{i}" for i in itertools.chain(
+                    ["dY"], sorted(required_forward_inputs))
+            ] + [f"_d{i}" for i in sorted(required_gradients)
+                 ] + ["__dace_cudnn_workspace"]
+            calls, graph_init, graph_exit, graph_state_fields = _cuda_graph_code(
+                unique_id, arguments, calls)
+            init_parts.append(graph_init)
+            finalize_parts.append(graph_exit)
+
+        tasklet_code = f"""
+        {donnx.environments.cuDNN.handle_setup_code(forward_node)}
+        void *__dace_cudnn_workspace = __state->cudnn_workspace->Get(__dace_current_stream);
+        {calls}
+        """
+
+        init_code = "{\n" + "".join(init_parts) + "\n}"
+        finalize_code = "{\n" + "".join(finalize_parts) + "\n}"
         tasklet = nstate.add_tasklet(
             unique_id, {
                 f"_{i}": dace.pointer(T)
@@ -724,25 +1387,18 @@ class CuDNNConvBackward(BackwardImplementation):
                 f"cudnnFilterDescriptor_t *{unique_id}_dW_desc;"
                 f"cudnnConvolutionBwdDataAlgo_t *{unique_id}_data_algo;"
                 f"cudnnConvolutionBwdFilterAlgo_t *{unique_id}_filter_algo;"
-                f"cudnnConvolutionDescriptor_t *{unique_id}_conv_desc;",
-                f"float *{unique_id}_workspace;",
-                f"size_t *{unique_id}_workspace_size;"
-            ],
+                f"cudnnConvolutionDescriptor_t *{unique_id}_conv_desc;"
+            ] + graph_state_fields,
             code_init=init_code,
             code_exit=finalize_code)
         tasklet.environments = {donnx.environments.cuDNN.full_class_path()}
 
-        nstate.add_edge(
-            nstate.add_read(result.given_grad_names["Y"]), None, tasklet,
-            f"_dY", nsdfg.make_array_memlet((result.given_grad_names["Y"])))
-        for name in sorted(required_forward_inputs):
-            nstate.add_edge(nstate.add_read(name), None, tasklet, f"_{name}",
-                            nsdfg.make_array_memlet(name))
-
-        for name in sorted(required_gradients):
-            arr_name = result.required_grad_names[name]
-            nstate.add_edge(tasklet, f"_d{name}", nstate.add_write(arr_name),
-                            None, nsdfg.make_array_memlet(arr_name))
+        butils.wire_tasklet(nstate, tasklet,
+                            [(result.given_grad_names["Y"], "_dY")] +
+                            [(name, f"_{name}")
+                             for name in sorted(required_forward_inputs)],
+                            [(result.required_grad_names[name], f"_d{name}")
+                             for name in sorted(required_gradients)])
 
         inputs = {result.given_grad_names["Y"]}.union(required_forward_inputs)
         outputs = {
@@ -775,9 +1431,15 @@ class CuDNNConvTransposeBackward(BackwardImplementation):
             "fft_tiling"
             "3"
             "winograd_nonfused"
+
+        Like the forward pass, the math type is chosen using ``CudnnConvolution.allow_tensor_op_conversion``.
+
+        If ``use_cuda_graph`` is set, the cuDNN calls are captured in a CUDA graph which is replayed on subsequent
+        calls.
     """
     default_data_algorithm = "auto"
     default_filter_algorithm = "auto"
+    use_cuda_graph = False
 
     @staticmethod
     def backward_can_be_applied(node: nd.Node, state: dace.SDFGState,
@@ -813,8 +1475,8 @@ class CuDNNConvTransposeBackward(BackwardImplementation):
         # setup non-gradient arrays
         required_forward_inputs = ["W", "X"]
         for i in sorted(required_forward_inputs):
-            new_desc = copy.deepcopy(
-                butils.forward_in_desc_with_name(forward_node, context, i))
+            new_desc = butils.forward_in_desc_with_name(
+                forward_node, context, i).clone()
             new_desc.transient = False
             nsdfg.add_datadesc(i, new_desc)
 
@@ -825,8 +1487,8 @@ class CuDNNConvTransposeBackward(BackwardImplementation):
             context.forward_sdfg.node_id(context.forward_state),
             context.forward_state.node_id(forward_node))
 
-        init_code = ""
-        finalize_code = ""
+        init_parts: List[str] = []
+        finalize_parts: List[str] = []
 
         #######################
         # add descriptor init code for gradients
@@ -845,22 +1507,22 @@ class CuDNNConvTransposeBackward(BackwardImplementation):
                 f"{unique_id}_d{r}_desc",
                 is_filter,
                 shape=shape)
-            init_code += init
-            finalize_code += exit
+            init_parts.append(init)
+            finalize_parts.append(exit)
 
         for r in sorted(required_forward_inputs):
             desc = butils.forward_in_desc_with_name(forward_node, context, r)
             is_filter = r == "W"
             init, exit = cudnn_implementations._cudnn_tensor_descriptor_code(
                 desc, f"{unique_id}_{r}_desc", is_filter)
-            init_code += init
-            finalize_code += exit
+            init_parts.append(init)
+            finalize_parts.append(exit)
 
         init, exit = cudnn_implementations._cudnn_tensor_descriptor_code(
             nsdfg.arrays[result.given_grad_names["Y"]], f"{unique_id}_dY_desc",
             False)
-        init_code += init
-        finalize_code += exit
+        init_parts.append(init)
+        finalize_parts.append(exit)
 
         #######################
         # setup conv descriptor
@@ -873,7 +1535,7 @@ class CuDNNConvTransposeBackward(BackwardImplementation):
             pad_h, pad_w = forward_node.pads[0], forward_node.pads[1]
             stride_h, stride_w = forward_node.strides
             dilation_h, dilation_w = forward_node.dilations
-        init_code += f"""
+        init_parts.append(f"""
         __state->{unique_id}_conv_desc = new cudnnConvolutionDescriptor_t; 
         daceml::cudnn::CheckCudnnError(cudnnCreateConvolutionDescriptor(__state->{unique_id}_conv_desc));
         daceml::cudnn::CheckCudnnError(cudnnSetConvolution2dDescriptor(
@@ -886,18 +1548,21 @@ class CuDNNConvTransposeBackward(BackwardImplementation):
             {dilation_w},
             CUDNN_CROSS_CORRELATION,
             {cudnn_implementations._DACE_DTYPE_TO_CUDNN_DTYPE[T]}));
-        """
+        daceml::cudnn::CheckCudnnError(cudnnSetConvolutionMathType(
+            *__state->{unique_id}_conv_desc,
+            {cudnn_implementations._cudnn_conv_math_type(T, cudnn_implementations.CudnnConvolution.allow_tensor_op_conversion)}));
+        """)
         if forward_node.group != 1:
-            init_code += f"""
+            init_parts.append(f"""
             daceml::cudnn::CheckCudnnError(cudnnSetConvolutionGroupCount(
                 *__state->{unique_id}_conv_desc,
                 {forward_node.group}
                 ));
-            """
-        finalize_code += f"""
+            """)
+        finalize_parts.append(f"""
         daceml::cudnn::CheckCudnnError(cudnnDestroyConvolutionDescriptor(*__state->{unique_id}_conv_desc));
         delete __state->{unique_id}_conv_desc;
-        """
+        """)
 
         #######################
         # setup algorithms
@@ -912,7 +1577,9 @@ class CuDNNConvTransposeBackward(BackwardImplementation):
         else:
             filter_algo = CuDNNConvTransposeBackward.default_filter_algorithm
 
-        init_code += f"{donnx.environments.cuDNN.handle_setup_code(forward_node, init_stream=False)}"
+        init_parts.append(
+            donnx.environments.cuDNN.handle_setup_code(forward_node,
+                                                       init_stream=False))
         if data_algo == "auto" or filter_algo == "auto":
             # setup fake data
             free_fake_data_code, fake_data_init_code = setup_fake_data(
@@ -920,17 +1587,17 @@ class CuDNNConvTransposeBackward(BackwardImplementation):
                 True)
 
             # setup algo
-            init_code += f"""
+            init_parts.append(f"""
             // setup fake data
             {fake_data_init_code}
 
             // setup workspace
             void *search_ws; 
             cudaMalloc(&search_ws, {cudnn_implementations.CudnnConvolution.search_ws_size});
-            """
+            """)
 
         if filter_algo == "auto":
-            init_code += f"""
+            init_parts.append(f"""
             // run search
             cudnnConvolutionBwdFilterAlgoPerf_t filter_results;
             int filter_algo_count = 1;
@@ -952,15 +1619,15 @@ class CuDNNConvTransposeBackward(BackwardImplementation):
             __state->{unique_id}_filter_algo = new cudnnConvolutionBwdFilterAlgo_t;
             *__state->{unique_id}_filter_algo = filter_results.algo;
             printf("{unique_id} using filter algo %d\\n", *__state->{unique_id}_filter_algo);
-            """
+            """)
         else:
-            init_code += f"""
+            init_parts.append(f"""
             __state->{unique_id}_filter_algo = new cudnnConvolutionBwdFilterAlgo_t;
             *__state->{unique_id}_filter_algo = CUDNN_CONVOLUTION_BWD_FILTER_ALGO_{filter_algo.upper()};
-            """
+            """)
 
         if data_algo == "auto":
-            init_code += f"""
+            init_parts.append(f"""
             // run search
             cudnnConvolutionFwdAlgoPerf_t data_results;
             int data_algo_count = 1;
@@ -982,28 +1649,27 @@ class CuDNNConvTransposeBackward(BackwardImplementation):
             __state->{unique_id}_data_algo = new cudnnConvolutionFwdAlgo_t;
             *__state->{unique_id}_data_algo = data_results.algo;
             printf("{unique_id} using data algo %d\\n", *__state->{unique_id}_data_algo);
-            """
+            """)
         else:
-            init_code += f"""
+            init_parts.append(f"""
             __state->{unique_id}_data_algo = new cudnnConvolutionFwdAlgo_t;
             *__state->{unique_id}_data_algo = CUDNN_CONVOLUTION_FWD_ALGO_{data_algo.upper()};
-            """
+            """)
 
         if data_algo == "auto" or filter_algo == "auto":
-            init_code += f"""
+            init_parts.append(f"""
             cudaFree(search_ws);
             {free_fake_data_code}
-            """
+            """)
 
-        finalize_code += f"""
+        finalize_parts.append(f"""
              delete __state->{unique_id}_data_algo;
              delete __state->{unique_id}_filter_algo;
-        """
+        """)
 
         #######################
         # setup workspace
-        init_code += \
-            f"""
+        init_parts.append(f"""
         // Setup workspace for {unique_id}
         
         size_t data_ws_size;
@@ -1026,20 +1692,13 @@ class CuDNNConvTransposeBackward(BackwardImplementation):
             &filter_ws_size));
         
         size_t ws_size = max(filter_ws_size, data_ws_size);
-        __state->{unique_id}_workspace_size = new size_t;
-        *__state->{unique_id}_workspace_size = ws_size;
-        cudaMalloc(&__state->{unique_id}_workspace, ws_size);
-        """
-        finalize_code += f"""
-        cudaFree(__state->{unique_id}_workspace);
-        delete __state->{unique_id}_workspace_size;
-        """
+        __state->cudnn_workspace->Reserve(ws_size);
+        """)
 
         #######################
         # tasklet code
 
-        tasklet_code = f"""
-        {donnx.environments.cuDNN.handle_setup_code(forward_node)}
+        calls = f"""
         float alpha = 1.f;
         float beta = 0.f;
         daceml::cudnn::CheckCudnnError(cudnnConvolutionForward(
@@ -1051,8 +1710,8 @@ class CuDNNConvTransposeBackward(BackwardImplementation):
             _W,
             *__state->{unique_id}_conv_desc,
             *__state->{unique_id}_data_algo,
-            __state->{unique_id}_workspace,
-            *__state->{unique_id}_workspace_size,
+            __dace_cudnn_workspace,
+            __state->cudnn_workspace->Size(),
             &beta,
             *__state->{unique_id}_dX_desc,
             _dX));
@@ -1065,15 +1724,15 @@ class CuDNNConvTransposeBackward(BackwardImplementation):
             _X,
             *__state->{unique_id}_conv_desc,
             *__state->{unique_id}_filter_algo,
-            __state->{unique_id}_workspace,
-            *__state->{unique_id}_workspace_size,
+            __dace_cudnn_workspace,
+            __state->cudnn_workspace->Size(),
             &beta,
             *__state->{unique_id}_dW_desc,
             _dW));
         """
 
         if "B" in required_gradients:
-            tasklet_code += f"""
+            calls += f"""
             daceml::cudnn::CheckCudnnError(cudnnConvolutionBackwardBias(
                 __dace_cudnn_handle,
                 &alpha,
@@ -1084,8 +1743,26 @@ class CuDNNConvTransposeBackward(BackwardImplementation):
                 _dB));
             """
 
-        init_code = "{\n" + init_code + "\n}"
-        finalize_code = "{\n" + finalize_code + "\n}"
+        graph_state_fields = []
+        if CuDNNConvTransposeBackward.use_cuda_graph:
+            arguments = [
+                f"_{i}" for i in itertools.chain(
+                    ["dY"], sorted(required_forward_inputs))
+            ] + [f"_d{i}" for i in sorted(required_gradients)
+                 ] + ["__dace_cudnn_workspace"]
+            calls, graph_init, graph_exit, graph_state_fields = _cuda_graph_code(
+                unique_id, arguments, calls)
+            init_parts.append(graph_init)
+            finalize_parts.append(graph_exit)
+
+        tasklet_code = f"""
+        {donnx.environments.cuDNN.handle_setup_code(forward_node)}
+        void *__dace_cudnn_workspace = __state->cudnn_workspace->Get(__dace_current_stream);
+        {calls}
+        """
+
+        init_code = "{\n" + "".join(init_parts) + "\n}"
+        finalize_code = "{\n" + "".join(finalize_parts) + "\n}"
         tasklet = nstate.add_tasklet(
             unique_id, {
                 f"_{i}": dace.pointer(T)
@@ -1106,25 +1783,18 @@ class CuDNNConvTransposeBackward(BackwardImplementation):
                 f"cudnnFilterDescriptor_t *{unique_id}_dW_desc;"
                 f"cudnnConvolutionFwdAlgo_t *{unique_id}_data_algo;"
                 f"cudnnConvolutionBwdFilterAlgo_t *{unique_id}_filter_algo;"
-                f"cudnnConvolutionDescriptor_t *{unique_id}_conv_desc;",
-                f"float *{unique_id}_workspace;",
-                f"size_t *{unique_id}_workspace_size;"
-            ],
+                f"cudnnConvolutionDescriptor_t *{unique_id}_conv_desc;"
+            ] + graph_state_fields,
             code_init=init_code,
             code_exit=finalize_code)
         tasklet.environments = {donnx.environments.cuDNN.full_class_path()}
 
-        nstate.add_edge(
-            nstate.add_read(result.given_grad_names["Y"]), None, tasklet,
-            f"_dY", nsdfg.make_array_memlet((result.given_grad_names["Y"])))
-        for name in sorted(required_forward_inputs):
-            nstate.add_edge(nstate.add_read(name), None, tasklet, f"_{name}",
-                            nsdfg.make_array_memlet(name))
-
-        for name in sorted(required_gradients):
-            arr_name = result.required_grad_names[name]
-            nstate.add_edge(tasklet, f"_d{name}", nstate.add_write(arr_name),
-                            None, nsdfg.make_array_memlet(arr_name))
+        butils.wire_tasklet(nstate, tasklet,
+                            [(result.given_grad_names["Y"], "_dY")] +
+                            [(name, f"_{name}")
+                             for name in sorted(required_forward_inputs)],
+                            [(result.required_grad_names[name], f"_d{name}")
+                             for name in sorted(required_gradients)])
 
         inputs = {result.given_grad_names["Y"]}.union(required_forward_inputs)
         outputs = {
@@ -1242,17 +1912,12 @@ class PyTorchConvBackward(BackwardImplementation):
             daceml.torch.environments.PyTorch.full_class_path()
         }
 
-        nstate.add_edge(
-            nstate.add_read(result.given_grad_names["Y"]), None, tasklet,
-            f"_dY", nsdfg.make_array_memlet((result.given_grad_names["Y"])))
-        for name in sorted(required_forward_inputs):
-            nstate.add_edge(nstate.add_read(name), None, tasklet, f"_{name}",
-                            nsdfg.make_array_memlet(name))
-
-        for name in sorted(required_gradients):
-            arr_name = result.required_grad_names[name]
-            nstate.add_edge(tasklet, f"_d{name}", nstate.add_write(arr_name),
-                            None, nsdfg.make_array_memlet(arr_name))
+        butils.wire_tasklet(nstate, tasklet,
+                            [(result.given_grad_names["Y"], "_dY")] +
+                            [(name, f"_{name}")
+                             for name in sorted(required_forward_inputs)],
+                            [(result.required_grad_names[name], f"_d{name}")
+                             for name in sorted(required_gradients)])
 
         inputs = {result.given_grad_names["Y"]}.union(required_forward_inputs)
         outputs = {
@@ -1265,8 +1930,161 @@ class PyTorchConvBackward(BackwardImplementation):
         return node, result
 
 
+def _relu_backward(forward_node: nd.Node,
+                   context: BackwardContext) -> Tuple[nd.Node, BackwardResult]:
+    """ Add a placeholder for the backward pass of a ReLU as a nested SDFG containing a single map.
+
+        This is used for ReLUs whose backward pass is absorbed by the backward pass of a neighbouring node (see
+        :func:`_absorb_relu_backward`); the node only exists until the backward pass is complete. It copies the
+        gradient without masking it, and it does not read the input of the ReLU, so that the input is not forwarded
+        from the forward pass.
+
+        :param forward_node: the ReLU node.
+        :param context: the backward context.
+        :return: the backward node and the backward result.
+    """
+    result_node, result = butils.add_empty_sdfg_for_node(
+        forward_node, ["X_grad", "Y_grad"], context)
+
+    nstate = result_node.sdfg.add_state()
+    shape = butils.forward_in_desc_with_name(forward_node, context, "X").shape
+    map_ranges = {f"i{i}": f"0:{s}" for i, s in enumerate(shape)}
+    index_str = f"{', '.join(map_ranges.keys())}"
+    nstate.add_mapped_tasklet(
+        forward_node.label + "_backward",
+        map_ranges=map_ranges,
+        inputs={"__Y_grad": dace.Memlet(f"Y_grad[{index_str}]")},
+        code="__X_grad = __Y_grad",
+        outputs={"__X_grad": dace.Memlet(f"X_grad[{index_str}]")},
+        external_edges=True)
+
+    return result_node, result
+
+
+def _absorb_relu_backward(generator, relu_node: nd.Node):
+    """ Remove the backward node of a ReLU whose gradient is computed by a neighbouring backward node.
+
+        The consumers of the gradient of the ReLU input instead read the gradient of the ReLU output, which the
+        neighbouring backward node has already masked. This is meant to be run as a completion hook of the backward
+        pass generator.
+
+        :param generator: the backward pass generator.
+        :param relu_node: the forward ReLU node.
+    """
+    bstate = generator.backward_state
+    relu_bwd = generator.reverse_map[relu_node]
+    grad_edge = next(bstate.in_edges_by_connector(relu_bwd, "Y_grad"))
+    X_grad_node = next(bstate.out_edges_by_connector(relu_bwd, "X_grad")).dst
+    for edge in bstate.out_edges(X_grad_node):
+        new_edge = bstate.add_edge(grad_edge.src, grad_edge.src_conn, edge.dst,
+                                   edge.dst_conn, copy.deepcopy(edge.data))
+        # the consumer may be a map: rename the data in the whole memlet tree
+        for mte in bstate.memlet_tree(new_edge):
+            mte.data.data = grad_edge.src.data
+        bstate.remove_edge(edge)
+
+    inputs = [e.src for e in bstate.in_edges(relu_bwd)]
+    bstate.remove_node(relu_bwd)
+    bstate.remove_node(X_grad_node)
+    for input_node in inputs:
+        if bstate.degree(input_node) == 0:
+            bstate.remove_node(input_node)
+
+    # the gradient of the ReLU input is no longer written
+    bsdfg = generator.backward_sdfg
+    if not any(n.data == X_grad_node.data for s in bsdfg.nodes()
+               for n in s.data_nodes()):
+        del bsdfg.arrays[X_grad_node.data]
+        generator.backward_grad_arrays.pop(X_grad_node.data, None)
+
+
+def _bn_fused_relu(node: nd.Node, state: dace.SDFGState,
+                   sdfg: dace.SDFG) -> Optional[nd.Node]:
+    """ Find the ReLU that a cuDNN BatchNormalization can be fused with.
+
+        cuDNN only supports the fused ``CUDNN_BATCHNORM_OPS_BN_ACTIVATION`` mode for half precision NHWC tensors where
+        the number of channels is a multiple of 4. The parameters must then be single precision. Since the fused
+        forward pass writes the activated values, the output of the BatchNormalization may only be read by the ReLU.
+
+        :param node: the BatchNormalization node.
+        :param state: the state containing the node.
+        :param sdfg: the SDFG containing the state.
+        :return: the ReLU node, or ``None`` if the node cannot be fused.
+    """
+    if not CuDNNBatchNormBackward.fuse_relu or not isinstance(
+            node, donnx.ONNXBatchNormalization
+    ) or not CuDNNBatchNormBackward.backward_can_be_applied(node, state, sdfg):
+        return None
+
+    X_desc = utils.in_desc_with_name(node, state, sdfg, "X")
+    Y_desc = utils.out_desc_with_name(node, state, sdfg, "Y")
+    if (len(X_desc.shape) != 4 or X_desc.dtype != dace.float16
+            or X_desc.shape[1] % 4 != 0 or any(
+                cudnn_implementations._get_tensor_layout(desc) != "NHWC"
+                for desc in [X_desc, Y_desc])):
+        return None
+
+    # cuDNN derives float32 descriptors for the parameters of half precision inputs
+    if any(
+            utils.in_desc_with_name(node, state, sdfg, name).dtype !=
+            dace.float32 for name in ["scale", "B", "in_mean", "in_var"]):
+        return None
+
+    Y_node = utils.out_edge_with_name(node, state, "Y").dst
+    if (not isinstance(Y_node, nd.AccessNode)
+            or not Y_node.desc(sdfg).transient or state.in_degree(Y_node) != 1
+            or state.out_degree(Y_node) != 1):
+        return None
+
+    # the output may not be accessed anywhere else
+    if sum(n.data == Y_node.data for s in sdfg.nodes()
+           for n in s.data_nodes()) != 1:
+        return None
+
+    relu = state.out_edges(Y_node)[0].dst
+    return relu if isinstance(relu, donnx.ONNXRelu) else None
+
+
+@autoregister_params(op="Relu", name="cuDNN-BN")
+class CuDNNFusedReluBackward(BackwardImplementation):
+    """ Backward for a ReLU that is fused into the preceding cuDNN BatchNormalization.
+
+        The fused BatchNormalization backward reads the gradient of the ReLU output and removes this node once the
+        backward pass is complete.
+    """
+    @staticmethod
+    def backward_can_be_applied(node: nd.Node, state: dace.SDFGState,
+                                sdfg: dace.SDFG) -> bool:
+        X_node = utils.in_edge_with_name(node, state, "X").src
+        if not isinstance(X_node,
+                          nd.AccessNode) or state.in_degree(X_node) != 1:
+            return False
+        return _bn_fused_relu(state.in_edges(X_node)[0].src, state,
+                              sdfg) is node
+
+    @staticmethod
+    def backward(
+        forward_node: nd.Node, context: BackwardContext,
+        given_gradients: List[Optional[str]],
+        required_gradients: List[Optional[str]]
+    ) -> Tuple[nd.Node, BackwardResult]:
+
+        return _relu_backward(forward_node, context)
+
+
 @autoregister_params(op="BatchNormalization", name="cuDNN")
 class CuDNNBatchNormBackward(BackwardImplementation):
+    """ BatchNormalization backward using CUDNN.
+
+        If ``use_cuda_graph`` is set, the cuDNN call is captured in a CUDA graph which is replayed on subsequent calls.
+
+        If ``fuse_relu`` is set, a ReLU following the BatchNormalization is fused into both the forward and backward
+        cuDNN calls using ``CUDNN_BATCHNORM_OPS_BN_ACTIVATION``, where cuDNN supports it (see :func:`_bn_fused_relu`).
+        The backward pass of the ReLU is then absorbed into the BatchNormalization backward.
+    """
+    use_cuda_graph = False
+    fuse_relu = False
+
     @staticmethod
     def backward_can_be_applied(node: nd.Node, state: dace.SDFGState,
                                 sdfg: dace.SDFG) -> bool:
@@ -1280,173 +2098,200 @@ class CuDNNBatchNormBackward(BackwardImplementation):
         required_gradients: List[Optional[str]]
     ) -> Tuple[nd.Node, BackwardResult]:
 
-        nsdfg = dace.SDFG(forward_node.label + "_backward")
+        fsdfg = context.forward_sdfg
+        fstate = context.forward_state
+
         X_desc = butils.forward_in_desc_with_name(forward_node, context, "X")
-        scale_desc = butils.forward_in_desc_with_name(forward_node, context,
-                                                      "scale")
+        Y_desc = butils.forward_out_desc_with_name(forward_node, context, "Y")
         T = X_desc.dtype
 
-        # setup arrays
+        relu_node = _bn_fused_relu(forward_node, fstate, fsdfg)
+        bn_ops = "CUDNN_BATCHNORM_OPS_BN" if relu_node is None else "CUDNN_BATCHNORM_OPS_BN_ACTIVATION"
+
+        # the backward node is a single tasklet in the backward state. The connectors for values from the forward
+        # pass are named after the connectors of the forward node, so that the backward pass generator connects
+        # them; the gradients (which have the same descriptors as X and Y) are connected through the result.
         result = BackwardResult.empty()
-        result.required_grad_names["X"] = butils.add_backward_desc(
-            nsdfg, context.forward_sdfg, X_desc, "X")
-        result.given_grad_names["Y"] = butils.add_backward_desc_for_connector(
-            nsdfg, forward_node, context, "Y", input=False)
-        result.required_grad_names[
-            "scale"] = butils.add_backward_desc_for_connector(nsdfg,
-                                                              forward_node,
-                                                              context,
-                                                              "scale",
-                                                              input=True)
-        result.required_grad_names[
-            "B"] = butils.add_backward_desc_for_connector(nsdfg,
-                                                          forward_node,
-                                                          context,
-                                                          "B",
-                                                          input=True)
-
-        # input X
-        new_X_desc = copy.deepcopy(X_desc)
-        new_X_desc.transient = False
-        nsdfg.add_datadesc("X", new_X_desc)
-
-        # input scale
-        new_scale_desc = copy.deepcopy(scale_desc)
-        new_scale_desc.transient = False
-        nsdfg.add_datadesc("scale", new_scale_desc)
-
-        # saved vars
-        for saved in ["saved_mean", "saved_var"]:
-            saved_desc = copy.deepcopy(
-                butils.forward_out_desc_with_name(forward_node, context,
-                                                  saved))
-            saved_desc.transient = False
-            nsdfg.add_datadesc(saved, saved_desc)
+        result.given_grad_names["Y"] = "Y_grad"
+        result.required_grad_names["X"] = "X_grad"
+        result.required_grad_names["scale"] = "scale_grad"
+        result.required_grad_names["B"] = "B_grad"
 
-        # setup state
-        nstate = nsdfg.add_state()
         fwd_unique_id = "{}_{}_{}_{}".format(
-            clean_onnx_name(forward_node.name), context.forward_sdfg.sdfg_id,
-            context.forward_sdfg.node_id(context.forward_state),
-            context.forward_state.node_id(forward_node))
+            clean_onnx_name(forward_node.name), fsdfg.sdfg_id,
+            fsdfg.node_id(fstate), fstate.node_id(forward_node))
 
         unique_id = f"{fwd_unique_id}_bwd"
 
         init, exit = cudnn_implementations._cudnn_tensor_descriptor_code(
-            new_X_desc, f"{unique_id}_X_desc", False)
-        init_code = init
-        finalize_code = exit
+            X_desc, f"{unique_id}_X_desc", False)
+        init_parts: List[str] = [init]
+        finalize_parts: List[str] = [exit]
 
-        dX_desc = nsdfg.arrays[result.required_grad_names["X"]]
         init, exit = cudnn_implementations._cudnn_tensor_descriptor_code(
-            dX_desc, f"{unique_id}_dX_desc", False)
-        init_code += init
-        finalize_code += exit
+            X_desc, f"{unique_id}_dX_desc", False)
+        init_parts.append(init)
+        finalize_parts.append(exit)
 
-        dY_desc = nsdfg.arrays[result.given_grad_names["Y"]]
         init, exit = cudnn_implementations._cudnn_tensor_descriptor_code(
-            dY_desc, f"{unique_id}_dY_desc", False)
-        init_code += init
-        finalize_code += exit
+            Y_desc, f"{unique_id}_dY_desc", False)
+        init_parts.append(init)
+        finalize_parts.append(exit)
 
         # setup scale descriptor
-        init_code += f"""
+        init_parts.append(f"""
         __state->{unique_id}_dScale_desc = new cudnnTensorDescriptor_t; 
         daceml::cudnn::CheckCudnnError(cudnnCreateTensorDescriptor(__state->{unique_id}_dScale_desc));
         daceml::cudnn::CheckCudnnError(cudnnDeriveBNTensorDescriptor(
             *__state->{unique_id}_dScale_desc,
             *__state->{unique_id}_X_desc,
             CUDNN_BATCHNORM_SPATIAL));
-        """
-        finalize_code += f"""
+        """)
+        finalize_parts.append(f"""
         daceml::cudnn::CheckCudnnError(cudnnDestroyTensorDescriptor(*__state->{unique_id}_dScale_desc));
         delete __state->{unique_id}_dScale_desc;
-        """
+        """)
+
+        if relu_node is not None:
+            init, exit = cudnn_implementations._cudnn_tensor_descriptor_code(
+                Y_desc, f"{unique_id}_Y_desc", False)
+            init_parts.append(init)
+            finalize_parts.append(exit)
+
+            init_parts.append(f"""
+            __state->{unique_id}_activation_desc = new cudnnActivationDescriptor_t;
+            daceml::cudnn::CheckCudnnError(cudnnCreateActivationDescriptor(__state->{unique_id}_activation_desc));
+            daceml::cudnn::CheckCudnnError(cudnnSetActivationDescriptor(
+                *__state->{unique_id}_activation_desc,
+                CUDNN_ACTIVATION_RELU,
+                CUDNN_PROPAGATE_NAN,
+                0.0));
+            """)
+            finalize_parts.append(f"""
+            daceml::cudnn::CheckCudnnError(cudnnDestroyActivationDescriptor(*__state->{unique_id}_activation_desc));
+            delete __state->{unique_id}_activation_desc;
+            """)
+            Y_desc_str = f"*__state->{unique_id}_Y_desc"
+            activation_desc = f"*__state->{unique_id}_activation_desc"
+        else:
+            Y_desc_str = activation_desc = "nullptr"
 
         # setup workspace
-        init_code += \
-            f"""
+        init_parts.append(f"""
         {donnx.environments.cuDNN.handle_setup_code(forward_node, init_stream=False)}
         // Setup workspace and reserved space for {unique_id}
         size_t ws_size;
         daceml::cudnn::CheckCudnnError(cudnnGetBatchNormalizationBackwardExWorkspaceSize(
             __dace_cudnn_handle,
             CUDNN_BATCHNORM_SPATIAL,
-            CUDNN_BATCHNORM_OPS_BN,
+            {bn_ops},
             *__state->{unique_id}_X_desc,
-            nullptr,
+            {Y_desc_str},
             *__state->{unique_id}_dY_desc,
             nullptr,
             *__state->{unique_id}_dX_desc,
             *__state->{unique_id}_dScale_desc,
-            nullptr,
+            {activation_desc},
             &ws_size));
-        __state->{unique_id}_workspace_size = new size_t;
-        *__state->{unique_id}_workspace_size = ws_size;
-        cudaMalloc(&__state->{unique_id}_workspace, ws_size);
-        """
-        finalize_code += f"""
-        delete __state->{unique_id}_workspace_size;
-        cudaFree(__state->{unique_id}_workspace);
-        """
+        __state->cudnn_workspace->Reserve(ws_size);
 
-        tasklet_code = f"""
-        {donnx.environments.cuDNN.handle_setup_code(forward_node)}
+        // the forward pass allocated the reserved space with the same parameters, so it has this size
+        daceml::cudnn::CheckCudnnError(cudnnGetBatchNormalizationTrainingExReserveSpaceSize(
+            __dace_cudnn_handle,
+            CUDNN_BATCHNORM_SPATIAL,
+            {bn_ops},
+            {activation_desc},
+            *__state->{unique_id}_X_desc,
+            &__state->{unique_id}_reserved_size));
+        """)
+
+        calls = f"""
         float alpha = 1.f;
         float beta = 0.f;
         daceml::cudnn::CheckCudnnError(cudnnBatchNormalizationBackwardEx(
             __dace_cudnn_handle,
             CUDNN_BATCHNORM_SPATIAL,
-            CUDNN_BATCHNORM_OPS_BN,
+            {bn_ops},
             &alpha,
             &beta,
             &alpha,
             &beta,
             *__state->{unique_id}_X_desc,
-            _X,
-            nullptr,
-            nullptr,
+            X,
+            {Y_desc_str},
+            {"nullptr" if relu_node is None else "Y"},
             *__state->{unique_id}_dY_desc,
-            _dY,
+            Y_grad,
             nullptr,
             nullptr,
             *__state->{unique_id}_dX_desc,
-            _dX,
+            X_grad,
             *__state->{unique_id}_dScale_desc,
-            _scale,
-            nullptr,
-            _dScale,
-            _dBias,
+            scale,
+            {"nullptr" if relu_node is None else "B"},
+            scale_grad,
+            B_grad,
             {forward_node.epsilon},
-            _saved_mean,
-            _saved_var,
-            nullptr,
-            __state->{unique_id}_workspace,
-            *__state->{unique_id}_workspace_size,
-            _reserved_ptr,
-            _reserved_size
+            saved_mean,
+            saved_var,
+            {activation_desc},
+            __dace_cudnn_workspace,
+            __state->cudnn_workspace->Size(),
+            reserved_ptr,
+            __state->{unique_id}_reserved_size
             ));
         """
 
+        # the parameters and statistics may have a different type than X (see _bn_fused_relu)
+        param_dtypes = {
+            name: butils.forward_in_desc_with_name(forward_node, context,
+                                                   name).dtype
+            for name in ["scale", "B"]
+        }
+        param_dtypes.update({
+            name: butils.forward_out_desc_with_name(forward_node, context,
+                                                    name).dtype
+            for name in ["saved_mean", "saved_var"]
+        })
+
         in_connectors = {
             "X": dace.pointer(T),
-            "dY": dace.pointer(T),
-            "scale": dace.pointer(T),
-            "saved_mean": dace.pointer(T),
-            "saved_var": dace.pointer(T),
-            "reserved_ptr": dace.pointer(dace.typeclass(None)),
-            # Here we assume size_t is int64. Unfortunately this is a bad hack and not true
-            "reserved_size": dace.int64
+            "Y_grad": dace.pointer(T),
+            "scale": dace.pointer(param_dtypes["scale"]),
+            "saved_mean": dace.pointer(param_dtypes["saved_mean"]),
+            "saved_var": dace.pointer(param_dtypes["saved_var"]),
+            "reserved_ptr": dace.pointer(dace.typeclass(None))
+        }
+        if relu_node is not None:
+            in_connectors["Y"] = dace.pointer(T)
+            in_connectors["B"] = dace.pointer(param_dtypes["B"])
+        out_connectors = {
+            "X_grad": dace.pointer(T),
+            "scale_grad": dace.pointer(param_dtypes["scale"]),
+            "B_grad": dace.pointer(param_dtypes["B"])
         }
-        out_connectors = ["dX", "dScale", "dBias"]
 
-        init_code = "{\n" + init_code + "\n}"
-        finalize_code = "{\n" + finalize_code + "\n}"
-        tasklet = nstate.add_tasklet(
-            unique_id, {f"_{i}": t
-                        for i, t in in_connectors.items()},
-            {f"_{i}": dace.pointer(T)
-             for i in out_connectors},
+        graph_state_fields = []
+        if CuDNNBatchNormBackward.use_cuda_graph:
+            arguments = list(itertools.chain(
+                in_connectors, out_connectors)) + ["__dace_cudnn_workspace"]
+            calls, graph_init, graph_exit, graph_state_fields = _cuda_graph_code(
+                unique_id, arguments, calls)
+            init_parts.append(graph_init)
+            finalize_parts.append(graph_exit)
+
+        tasklet_code = f"""
+        {donnx.environments.cuDNN.handle_setup_code(forward_node)}
+        void *__dace_cudnn_workspace = __state->cudnn_workspace->Get(__dace_current_stream);
+        {calls}
+        """
+
+        init_code = "{\n" + "".join(init_parts) + "\n}"
+        finalize_code = "{\n" + "".join(finalize_parts) + "\n}"
+        tasklet = context.backward_state.add_tasklet(
+            unique_id,
+            in_connectors,
+            out_connectors,
             tasklet_code,
             dace.dtypes.Language.CPP,
             code_init=init_code,
@@ -1460,31 +2305,12 @@ class CuDNNBatchNormBackward(BackwardImplementation):
                 f"cudnnFilterDescriptor_t *{unique_id}_dW_desc;",
                 f"cudnnTensorDescriptor_t *{unique_id}_dScale_desc;",
                 f"cudnnConvolutionDescriptor_t *{unique_id}_conv_desc;",
-                f"float *{unique_id}_workspace;",
-                f"size_t *{unique_id}_workspace_size;"
-            ])
+                f"cudnnTensorDescriptor_t *{unique_id}_Y_desc;",
+                f"cudnnActivationDescriptor_t *{unique_id}_activation_desc;",
+                f"size_t {unique_id}_reserved_size;"
+            ] + graph_state_fields)
         tasklet.environments = {donnx.environments.cuDNN.full_class_path()}
 
-        # connect inputs
-        arr_name = result.given_grad_names["Y"]
-        nstate.add_edge(nstate.add_read(arr_name), None, tasklet, f"_dY",
-                        nsdfg.make_array_memlet(arr_name))
-
-        for arr_name in ["X", "saved_mean", "scale", "saved_var"]:
-            nstate.add_edge(nstate.add_read(arr_name), None, tasklet,
-                            f"_{arr_name}", nsdfg.make_array_memlet(arr_name))
-
-        # connect outputs
-        arr_name = result.required_grad_names["X"]
-        nstate.add_edge(tasklet, "_dX", nstate.add_write(arr_name), None,
-                        nsdfg.make_array_memlet(arr_name))
-        arr_name = result.required_grad_names["scale"]
-        nstate.add_edge(tasklet, "_dScale", nstate.add_write(arr_name), None,
-                        nsdfg.make_array_memlet(arr_name))
-        arr_name = result.required_grad_names["B"]
-        nstate.add_edge(tasklet, "_dBias", nstate.add_write(arr_name), None,
-                        nsdfg.make_array_memlet(arr_name))
-
         # after differentiation, but before validation, we must lower the fwd node,
         # giving the argument that tells it that we need the reserved_ptr output
         def expand(_):
@@ -1495,9 +2321,10 @@ class CuDNNBatchNormBackward(BackwardImplementation):
                 def expansion(cls, node, state, sdfg):
                     return CudnnBatchNormalizationTraining.forward(
                         forward_node,
-                        context.forward_state,
-                        context.forward_sdfg,
-                        reserved_ptr=True)
+                        fstate,
+                        fsdfg,
+                        reserved_ptr=True,
+                        relu=relu_node is not None)
 
                 @staticmethod
                 def annotates_memlets() -> bool:
@@ -1505,71 +2332,62 @@ class CuDNNBatchNormBackward(BackwardImplementation):
 
             Expansion._match_node = xf.PatternNode(
                 donnx.ONNXBatchNormalization)
-            Expansion.apply_to(context.forward_sdfg,
-                               verify=False,
-                               _match_node=forward_node)
+            Expansion.apply_to(fsdfg, verify=False, _match_node=forward_node)
 
         context.backward_generator.completion_hooks.append(expand)
 
-        # forward the opaque ptr and size
-        assert forward_node.add_out_connector("reserved_ptr")
-        assert forward_node.add_out_connector("reserved_size")
-        reserved_ptr_name, reserved_desc = context.forward_sdfg.add_scalar(
-            f"reserved_ptr",
+        # forward the opaque ptr; its size is recomputed in the init code
+        if not forward_node.add_out_connector("reserved_ptr"):
+            raise AutoDiffException(
+                f"{forward_node} already has a reserved_ptr connector")
+        reserved_ptr_name, _ = fsdfg.add_scalar(
+            butils.new_forward_name(context, "reserved_ptr"),
             dace.pointer(dace.typeclass(None)),
             storage=dtypes.StorageType.CPU_Heap,
-            transient=True,
-            find_new_name=True)
+            transient=True)
 
-        reserved_size_name, reserved_size_desc = context.forward_sdfg.add_scalar(
-            f"reserved_size",
-            dace.int64,
-            storage=dtypes.StorageType.CPU_Heap,
-            transient=True,
-            find_new_name=True)
-
-        context.forward_state.add_edge(
-            forward_node, "reserved_ptr",
-            context.forward_state.add_read(reserved_ptr_name), None,
-            dace.Memlet(f"{reserved_ptr_name}[0]"))
-        context.forward_state.add_edge(
-            forward_node, "reserved_size",
-            context.forward_state.add_read(reserved_size_name), None,
-            dace.Memlet(f"{reserved_size_name}[0]"))
-
-        bwd_reserved_desc = copy.deepcopy(reserved_desc)
-        bwd_reserved_desc.transient = False
-        bwd_reserved_size_desc = copy.deepcopy(reserved_size_desc)
-        bwd_reserved_size_desc.transient = False
-        nsdfg.add_datadesc("reserved_ptr", bwd_reserved_desc)
-        nsdfg.add_datadesc("reserved_size", bwd_reserved_size_desc)
-        nstate.add_edge(nstate.add_read("reserved_ptr"), None, tasklet,
-                        "_reserved_ptr", dace.Memlet("reserved_ptr[0]"))
-        nstate.add_edge(nstate.add_read("reserved_size"), None, tasklet,
-                        "_reserved_size", dace.Memlet("reserved_size[0]"))
-
-        node = context.backward_state.add_nested_sdfg(
-            nsdfg, None, {
-                "X", result.given_grad_names["Y"], "scale", "saved_mean",
-                "saved_var", "reserved_ptr", "reserved_size"
-            }, {result.required_grad_names[a]
-                for a in {"X", "scale", "B"}})
-
-        butils.connect_output_from_forward(forward_node, node, context,
+        fstate.add_edge(forward_node, "reserved_ptr",
+                        fstate.add_read(reserved_ptr_name), None,
+                        dace.Memlet(f"{reserved_ptr_name}[0]"))
+
+        butils.connect_output_from_forward(forward_node, tasklet, context,
                                            "saved_mean")
-        butils.connect_output_from_forward(forward_node, node, context,
+        butils.connect_output_from_forward(forward_node, tasklet, context,
                                            "saved_var")
 
-        butils.connect_output_from_forward(forward_node, node, context,
+        butils.connect_output_from_forward(forward_node, tasklet, context,
                                            "reserved_ptr")
-        butils.connect_output_from_forward(forward_node, node, context,
-                                           "reserved_size")
 
-        return node, result
+        if relu_node is not None:
+            butils.connect_output_from_forward(forward_node, tasklet, context,
+                                               "Y")
+
+            # the fused call applies the ReLU gradient itself
+            context.backward_generator.completion_hooks.append(
+                functools.partial(_absorb_relu_backward, relu_node=relu_node))
+
+        return tasklet, result
 
 
 @autoregister_params(op="GlobalAveragePool", name="pure")
 class PureGlobalAveragePoolingBackward(BackwardImplementation):
+    """ GlobalAveragePool backward: broadcasts the scaled output gradient over the spatial dimensions.
+
+        On the CPU, if the spatial dimensions of the input are contiguous and contain at least ``fill_threshold``
+        elements, the broadcast is emitted as a ``std::fill_n`` per channel instead of a map.
+
+        On the GPU, the broadcast is a map with one thread per element, so that the stores are coalesced. For
+        contiguous single precision inputs where the number of spatial elements and the strides of the batch and
+        channel dimensions are divisible by four, each thread instead writes four elements using a ``float4`` store.
+
+        If ``fuse_relu`` is set and the input of the GlobalAveragePool is produced by a ReLU (see
+        :func:`_gap_fused_relu`), the backward pass computes the gradient of the ReLU input directly, masking the
+        broadcast gradient with the forward output of the ReLU. The backward pass of the ReLU is then absorbed into the
+        GlobalAveragePool backward, which avoids writing and reading back the intermediate gradient.
+    """
+    fill_threshold = 64
+    fuse_relu = False
+
     @staticmethod
     def backward_can_be_applied(node: nd.Node, state: dace.SDFGState,
                                 sdfg: dace.SDFG) -> bool:
@@ -1585,16 +2403,201 @@ class PureGlobalAveragePoolingBackward(BackwardImplementation):
         N, C, H, W = desc.shape
         dtype = desc.dtype
 
-        inv = 1.0 / (H * W)
+        relu_node = _gap_fused_relu(forward_node, context.forward_state,
+                                    context.forward_sdfg)
+        if relu_node is not None:
+            context.backward_generator.completion_hooks.append(
+                functools.partial(_absorb_relu_backward, relu_node=relu_node))
+
+        gpu = desc.storage is dtypes.StorageType.GPU_Global
+        contiguous = tuple(desc.strides[2:]) == (W, 1)
+        # each (n, c) plane must start on a 16 byte boundary to be written with float4 stores
+        use_float4 = (gpu and contiguous and dtype == dace.float32
+                      and (H * W) % 4 == 0 and desc.strides[0] % 4 == 0
+                      and desc.strides[1] % 4 == 0
+                      and all(o == 0 for o in desc.offset))
+        use_fill = (relu_node is None and not gpu and contiguous
+                    and not dace.symbolic.issymbolic(H * W) and
+                    H * W >= PureGlobalAveragePoolingBackward.fill_threshold)
 
-        def bwd(X_grad, Y_grad):
-            for n, c, h, w in dace.map[0:N, 0:C, 0:H, 0:W]:
-                with dace.tasklet:
-                    y_grad << Y_grad[n, c]
-                    x_grad >> X_grad[n, c, h, w]
-                    x_grad = y_grad * dtype(inv)
+        result_node, result = butils.add_empty_sdfg_for_node(
+            forward_node,
+            ["X_grad", "Y_grad"] + ([] if relu_node is None else ["X"]),
+            context)
+        nsdfg = result_node.sdfg
+        nstate = nsdfg.add_state()
+
+        if dace.symbolic.issymbolic(H * W):
+            # the spatial size is only known at runtime
+            inv = f"(1.0 / ({H * W}))"
+        else:
+            # bind 1 / (H * W) as a constant of the nested SDFG, so that it is emitted once as a constexpr instead of
+            # being inlined as a literal in the tasklet
+            inv_dtype = _accumulator_dtype(dtype)
+            nsdfg.add_constant("gap_inv", inv_dtype.type(1.0 / (H * W)),
+                               dace.data.Scalar(inv_dtype))
+            inv = "gap_inv"
+
+        label = forward_node.label + "_backward"
+        spatial_ranges = dict(n=f"0:{N}", c=f"0:{C}", h=f"0:{H}", w=f"0:{W}")
+        if relu_node is not None:
+            # X is the output of the ReLU, so this is the gradient of the ReLU input
+            nstate.add_mapped_tasklet(
+                label,
+                map_ranges=spatial_ranges,
+                inputs={
+                    "__y_grad": dace.Memlet("Y_grad[n, c, 0, 0]"),
+                    "__x": dace.Memlet("X[n, c, h, w]")
+                },
+                code=f"__x_grad = __y_grad * {inv} if __x > 0 else 0",
+                outputs={"__x_grad": dace.Memlet("X_grad[n, c, h, w]")},
+                external_edges=True)
+        elif use_float4:
+            # view the gradient with flattened spatial dimensions inside the nested SDFG, so that each thread's memlet
+            # covers exactly the four elements it stores
+            nsdfg.arrays["X_grad"] = dace.data.Array(
+                dtype, [N, C, H * W],
+                storage=desc.storage,
+                strides=[desc.strides[0], desc.strides[1], 1],
+                total_size=desc.total_size)
+            nstate.add_mapped_tasklet(
+                label,
+                map_ranges=dict(n=f"0:{N}", c=f"0:{C}", i=f"0:{H * W // 4}"),
+                inputs={"__y_grad": dace.Memlet("Y_grad[n, c, 0, 0]")},
+                code=f"""
+                float v = __y_grad * {inv};
+                *reinterpret_cast<float4 *>(__x_grad) = make_float4(v, v, v, v);
+                """,
+                outputs={
+                    "__x_grad": dace.Memlet("X_grad[n, c, 4 * i:4 * i + 4]")
+                },
+                language=dace.Language.CPP,
+                external_edges=True)
+        elif gpu:
+            nstate.add_mapped_tasklet(
+                label,
+                map_ranges=spatial_ranges,
+                inputs={"__y_grad": dace.Memlet("Y_grad[n, c, 0, 0]")},
+                code=f"__x_grad = __y_grad * {inv}",
+                outputs={"__x_grad": dace.Memlet("X_grad[n, c, h, w]")},
+                external_edges=True)
+        else:
+            # scale once per channel, then broadcast over the spatial dims
+            nsdfg.add_scalar("scaled", dtype, transient=True)
+            map_entry, map_exit = nstate.add_map(label,
+                                                 dict(n=f"0:{N}", c=f"0:{C}"))
+            scale = nstate.add_tasklet("scale", {"__y_grad"}, {"__s"},
+                                       f"__s = __y_grad * {inv}")
+            scaled = nstate.add_access("scaled")
+            nstate.add_memlet_path(nstate.add_read("Y_grad"),
+                                   map_entry,
+                                   scale,
+                                   dst_conn="__y_grad",
+                                   memlet=dace.Memlet("Y_grad[n, c, 0, 0]"))
+            nstate.add_edge(scale, "__s", scaled, None,
+                            dace.Memlet("scaled[0]"))
+
+            X_grad = nstate.add_write("X_grad")
+            if use_fill:
+                fill = nstate.add_tasklet(
+                    "fill", {"__s"}, {"__x_grad"},
+                    f"std::fill_n(__x_grad, {H * W}, __s);",
+                    language=dace.Language.CPP)
+                nstate.add_edge(scaled, None, fill, "__s",
+                                dace.Memlet("scaled[0]"))
+                nstate.add_memlet_path(
+                    fill,
+                    map_exit,
+                    X_grad,
+                    src_conn="__x_grad",
+                    memlet=dace.Memlet(f"X_grad[n, c, 0:{H}, 0:{W}]"))
+            else:
+                inner_entry, inner_exit = nstate.add_map(
+                    "broadcast", dict(h=f"0:{H}", w=f"0:{W}"))
+                broadcast = nstate.add_tasklet("broadcast", {"__s"},
+                                               {"__x_grad"}, "__x_grad = __s")
+                nstate.add_memlet_path(scaled,
+                                       inner_entry,
+                                       broadcast,
+                                       dst_conn="__s",
+                                       memlet=dace.Memlet("scaled[0]"))
+                nstate.add_memlet_path(
+                    broadcast,
+                    inner_exit,
+                    map_exit,
+                    X_grad,
+                    src_conn="__x_grad",
+                    memlet=dace.Memlet("X_grad[n, c, h, w]"))
 
-        return butils.backward_program_for_node(bwd, context, forward_node)
+        return result_node, result
+
+
+def _gap_fused_relu(node: nd.Node, state: dace.SDFGState,
+                    sdfg: dace.SDFG) -> Optional[nd.Node]:
+    """ Find the ReLU whose backward pass can be absorbed into the backward pass of a GlobalAveragePool.
+
+        Since the backward pass of the ReLU is removed, the input and output of the ReLU may only be accessed by the
+        ReLU and the GlobalAveragePool. ReLUs that are fused into a cuDNN BatchNormalization are not fused again.
+
+        :param node: the GlobalAveragePool node.
+        :param state: the state containing the node.
+        :param sdfg: the SDFG containing the state.
+        :return: the ReLU node, or ``None`` if the node cannot be fused.
+    """
+    if not PureGlobalAveragePoolingBackward.fuse_relu or not isinstance(
+            node, donnx.ONNXGlobalAveragePool
+    ) or not PureGlobalAveragePoolingBackward.backward_can_be_applied(
+            node, state, sdfg):
+        return None
+
+    def single_use(access: nd.Node) -> bool:
+        return (isinstance(access, nd.AccessNode)
+                and access.desc(sdfg).transient
+                and state.in_degree(access) == 1
+                and state.out_degree(access) == 1
+                and sum(n.data == access.data for s in sdfg.nodes()
+                        for n in s.data_nodes()) == 1)
+
+    Y_node = utils.in_edge_with_name(node, state, "X").src
+    if not single_use(Y_node):
+        return None
+
+    relu = state.in_edges(Y_node)[0].src
+    if not isinstance(relu, donnx.ONNXRelu):
+        return None
+
+    X_node = utils.in_edge_with_name(relu, state, "X").src
+    if not single_use(X_node) or _bn_fused_relu(
+            state.in_edges(X_node)[0].src, state, sdfg) is relu:
+        return None
+
+    return relu
+
+
+@autoregister_params(op="Relu", name="GAP")
+class GlobalAveragePoolFusedReluBackward(BackwardImplementation):
+    """ Backward for a ReLU that is fused into the following GlobalAveragePool.
+
+        The fused GlobalAveragePool backward computes the gradient of the ReLU input and removes this node once the
+        backward pass is complete.
+    """
+    @staticmethod
+    def backward_can_be_applied(node: nd.Node, state: dace.SDFGState,
+                                sdfg: dace.SDFG) -> bool:
+        Y_node = utils.out_edge_with_name(node, state, "Y").dst
+        if not isinstance(Y_node,
+                          nd.AccessNode) or state.out_degree(Y_node) != 1:
+            return False
+        return _gap_fused_relu(state.out_edges(Y_node)[0].dst, state,
+                               sdfg) is node
+
+    @staticmethod
+    def backward(
+        forward_node: nd.Node, context: BackwardContext,
+        given_gradients: List[Optional[str]],
+        required_gradients: List[Optional[str]]
+    ) -> Tuple[nd.Node, BackwardResult]:
+        return _relu_backward(forward_node, context)
 
 
 @autoregister_params(op="Transpose", name="default")
@@ -88,6 +88,24 @@ def add_backward_desc(backward_sdfg: dace.SDFG, forward_sdfg: dace.SDFG,
     return backward_sdfg.add_datadesc(backward_name, new_desc)
 
 
+def new_forward_name(context: BackwardContext, base: str) -> str:
+    """ Find a new name for an array that should be added to the forward SDFG.
+
+        Unlike ``find_new_name=True``, this doesn't scan all descriptors of the forward SDFG; instead, names are
+        generated using a counter per base name that is kept on the backward pass generator.
+
+        :param context: the backward context.
+        :param base: the base name of the array.
+        :return: a name of the form ``{base}_{i}`` that is not used in the forward SDFG.
+    """
+    counters = context.backward_generator.name_counters
+    while True:
+        name = f"{base}_{counters[base]}"
+        counters[base] += 1
+        if name not in context.forward_sdfg.arrays:
+            return name
+
+
 def add_empty_sdfg_for_node(
         forward_node: nd.Node, required_descriptors: typing.List[str],
         context: BackwardContext
@@ -251,16 +269,45 @@ def connect_output_from_forward(forward_node: nd.Node, backward_node: nd.Node,
 
         read = context.backward_state.add_read(output_arr_name)
     else:
-        cand = [
-            n for n, _ in context.backward_state.all_nodes_recursive()
-            if isinstance(n, nd.AccessNode) and n.data == output_arr_name
-        ]
-        read = cand[0]
+        # reuse the access node of the forwarded array, so that each array is read through a single node
+        read = next((n for n in context.backward_state.data_nodes()
+                     if n.data == output_arr_name), None)
+        if read is None:
+            read = context.backward_state.add_read(output_arr_name)
     context.backward_state.add_edge(read, None, backward_node,
                                     output_connector_name,
                                     copy.deepcopy(output_edge.data))
 
 
+def wire_tasklet(state: dace.SDFGState, tasklet: nd.Tasklet,
+                 inputs: typing.List[typing.Tuple[str, str]],
+                 outputs: typing.List[typing.Tuple[str, str]]):
+    """ Connect whole arrays to the connectors of a tasklet.
+
+        One access node is created per array and direction, even if the array is connected to several connectors.
+
+        :param state: the state containing the tasklet.
+        :param tasklet: the tasklet to connect.
+        :param inputs: a list of (array name, connector name) tuples to connect as inputs.
+        :param outputs: a list of (array name, connector name) tuples to connect as outputs.
+    """
+    arrays = state.parent.arrays
+
+    reads: typing.Dict[str, nd.AccessNode] = {}
+    for arr_name, connector in inputs:
+        if arr_name not in reads:
+            reads[arr_name] = state.add_read(arr_name)
+        state.add_edge(reads[arr_name], None, tasklet, connector,
+                       dace.Memlet.from_array(arr_name, arrays[arr_name]))
+
+    writes: typing.Dict[str, nd.AccessNode] = {}
+    for arr_name, connector in outputs:
+        if arr_name not in writes:
+            writes[arr_name] = state.add_write(arr_name)
+        state.add_edge(tasklet, connector, writes[arr_name], None,
+                       dace.Memlet.from_array(arr_name, arrays[arr_name]))
+
+
 def cast_consts_to_type(code: str, dtype: dace.typeclass) -> str:
     """ Convert a piece of code so that constants are wrapped in casts to ``dtype``.
 
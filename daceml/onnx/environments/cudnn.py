@@ -16,7 +16,11 @@ class cuDNN:
     cmake_compile_flags = []
     cmake_link_flags = []
     cmake_files = []
-    state_fields = ["daceml::cudnn::CudnnHandle *cudnn_handle;"]
+    state_fields = [
+        "daceml::cudnn::CudnnHandle *cudnn_handle;",
+        "daceml::cudnn::CudnnWorkspace *cudnn_workspace;",
+        "daceml::cudnn::CudnnDescriptorCache *cudnn_descriptors;"
+    ]
     dependencies = [CUDA]
 
     headers = {
@@ -25,8 +29,12 @@ class cuDNN:
     }
     init_code = """
         __state->cudnn_handle = new daceml::cudnn::CudnnHandle;
+        __state->cudnn_workspace = new daceml::cudnn::CudnnWorkspace;
+        __state->cudnn_descriptors = new daceml::cudnn::CudnnDescriptorCache;
     """
     finalize_code = """
+        delete __state->cudnn_descriptors;
+        delete __state->cudnn_workspace;
         delete __state->cudnn_handle;
     """
 
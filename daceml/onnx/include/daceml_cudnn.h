@@ -3,8 +3,11 @@
 #include <cuda_runtime.h>
 #include <cudnn.h>
 
+#include <algorithm>  // std::max
+#include <map>
 #include <stdexcept>  // std::runtime_error
 #include <string>
+#include <tuple>
 #include <unordered_map>
 #include <iostream>
 
@@ -63,6 +66,124 @@ class CudnnHandle {
   std::unordered_map<int, cudnnHandle_t> handles_;
 };
 
+/**
+ * Workspace memory shared by all CUDNN nodes of an SDFG.
+ *
+ * Nodes reserve the workspace size they require during initialization. The
+ * workspace is allocated lazily, once per stream, with the maximum size that
+ * was reserved. Using one workspace per stream ensures that nodes running
+ * concurrently on different streams don't share memory.
+ *
+ * Where available (CUDA 11.2+), the workspaces are allocated and reallocated
+ * with stream-ordered allocations on their stream, so that growing a workspace
+ * doesn't synchronize the device.
+ **/
+class CudnnWorkspace {
+ public:
+
+  void Reserve(size_t size) {
+    size_ = std::max(size_, size);
+  }
+
+  size_t Size() const {
+    return size_;
+  }
+
+  void* Get(cudaStream_t stream) {
+    // default-constructed entries are (nullptr, 0)
+    auto& w = workspaces_[stream];
+    if (w.second < size_) {
+      // Lazily (re)allocate the workspace of this stream
+#if CUDART_VERSION >= 11020
+      if (w.first != nullptr) {
+        cudaFreeAsync(w.first, stream);
+      }
+      w = {nullptr, 0};
+      cudaError_t err = cudaMallocAsync(&w.first, size_, stream);
+#else
+      if (w.first != nullptr) {
+        cudaFree(w.first);
+      }
+      w = {nullptr, 0};
+      cudaError_t err = cudaMalloc(&w.first, size_);
+#endif
+      if (err != cudaSuccess) {
+        // don't hand out the failed allocation; the next call retries
+        std::cout << "cuDNN error: Failed to allocate workspace." << std::endl;
+        w.first = nullptr;
+      } else {
+        w.second = size_;
+      }
+    }
+    return w.first;
+  }
+
+  ~CudnnWorkspace() {
+    // the streams may already be destroyed, so free synchronously
+    for (auto& w : workspaces_) {
+      cudaFree(w.second.first);
+    }
+  }
+
+ private:
+  size_t size_ = 0;
+  std::unordered_map<cudaStream_t, std::pair<void*, size_t>> workspaces_;
+};
+
+/**
+ * Cache of CUDNN tensor and filter descriptors.
+ *
+ * Descriptors with the same data type, format and dimensions are created once
+ * and shared between all CUDNN nodes of an SDFG. The returned descriptors are
+ * owned by the cache and must not be modified.
+ **/
+class CudnnDescriptorCache {
+ public:
+
+  cudnnTensorDescriptor_t* GetTensor(cudnnTensorFormat_t format,
+                                     cudnnDataType_t dtype,
+                                     int n, int c, int h, int w) {
+    auto key = std::make_tuple(format, dtype, n, c, h, w);
+    auto f = tensors_.find(key);
+    if (f == tensors_.end()) {
+      cudnnTensorDescriptor_t desc;
+      CheckCudnnError(cudnnCreateTensorDescriptor(&desc));
+      CheckCudnnError(cudnnSetTensor4dDescriptor(desc, format, dtype, n, c, h, w));
+      f = tensors_.emplace(key, desc).first;
+    }
+    return &f->second;
+  }
+
+  cudnnFilterDescriptor_t* GetFilter(cudnnDataType_t dtype,
+                                     cudnnTensorFormat_t format,
+                                     int k, int c, int h, int w) {
+    auto key = std::make_tuple(format, dtype, k, c, h, w);
+    auto f = filters_.find(key);
+    if (f == filters_.end()) {
+      cudnnFilterDescriptor_t desc;
+      CheckCudnnError(cudnnCreateFilterDescriptor(&desc));
+      CheckCudnnError(cudnnSetFilter4dDescriptor(desc, dtype, format, k, c, h, w));
+      f = filters_.emplace(key, desc).first;
+    }
+    return &f->second;
+  }
+
+  ~CudnnDescriptorCache() {
+    for (auto& t : tensors_) {
+      CheckCudnnError(cudnnDestroyTensorDescriptor(t.second));
+    }
+    for (auto& f : filters_) {
+      CheckCudnnError(cudnnDestroyFilterDescriptor(f.second));
+    }
+  }
+
+ private:
+  // std::map never invalidates pointers to its values on insertion
+  using Key = std::tuple<cudnnTensorFormat_t, cudnnDataType_t, int, int, int, int>;
+  std::map<Key, cudnnTensorDescriptor_t> tensors_;
+  std::map<Key, cudnnFilterDescriptor_t> filters_;
+};
+
     }  // namespace cudnn
 
 }  // namespace daceml
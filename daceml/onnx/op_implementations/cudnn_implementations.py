@@ -70,18 +70,24 @@ def _cudnn_tensor_descriptor_code(
         desc: dt.Array,
         state_field_name: str,
         filter: bool,
-        shape: Optional[List[int]] = None) -> Tuple[str, str]:
+        shape: Optional[List[int]] = None,
+        layout: Optional[str] = None) -> Tuple[str, str]:
     """ Emit the cudnn code for the tensor descriptor for a given dace descriptor.
 
+        The descriptor is taken from the descriptor cache of the cuDNN environment, so that identical descriptors are
+        shared between nodes. It is owned by the cache, and should not be modified.
+
         :param desc: the descriptor of the dace tensor.
         :param state_field_name: the name of the pointer variable where the descriptor should be stored.
         :param filter: True if the tensor is a filter.
         :param shape: (optional) the shape to override the shape of the tensor
+        :param layout: (optional) the layout to use instead of detecting it from the tensor
         :return: the init and exit code
     """
 
     # detect layout
-    layout = _get_tensor_layout(desc)
+    if layout is None:
+        layout = _get_tensor_layout(desc)
     if shape is None:
         shape = desc.shape
     if len(shape) < 4:
@@ -95,23 +101,19 @@ def _cudnn_tensor_descriptor_code(
     layout_str = f"CUDNN_TENSOR_{layout}"
     dtype_str = _DACE_DTYPE_TO_CUDNN_DTYPE[desc.dtype]
     init_code = f"""
-    __state->{state_field_name} = new cudnn{f_or_t_str}Descriptor_t;
-    daceml::cudnn::CheckCudnnError(cudnnCreate{f_or_t_str}Descriptor(__state->{state_field_name}));
-    daceml::cudnn::CheckCudnnError(cudnnSet{f_or_t_str}4dDescriptor(
-        *__state->{state_field_name}, 
+    __state->{state_field_name} = __state->cudnn_descriptors->Get{f_or_t_str}(
         {dtype_str if filter else layout_str},
         {layout_str if filter else dtype_str},
         {",".join(str(s) for s in shape)}
-    ));
-    """
-    exit_code = f"""\
-    daceml::cudnn::CheckCudnnError(cudnnDestroy{f_or_t_str}Descriptor(*__state->{state_field_name}));
-    delete __state->{state_field_name};
+    );
     """
+    # the descriptor is destroyed by the cache
+    exit_code = ""
     return init_code, exit_code
 
 
 _DACE_DTYPE_TO_CUDNN_DTYPE = {
+    dace.float16: "CUDNN_DATA_HALF",
     dace.float32: "CUDNN_DATA_FLOAT",
     dace.float64: "CUDNN_DATA_DOUBLE",
     dace.uint8: "CUDNN_DATA_UINT8",
@@ -120,6 +122,24 @@ _DACE_DTYPE_TO_CUDNN_DTYPE = {
 }
 
 
+def _cudnn_conv_math_type(dtype: dace.typeclass,
+                          allow_conversion: bool = False) -> str:
+    """ Get the cudnn math type for convolutions on tensors of type ``dtype``.
+
+        Tensor Core operations are enabled for half precision tensors.
+
+        :param dtype: the dtype of the convolution tensors.
+        :param allow_conversion: if True, allow cudnn to down-convert single precision tensors so that Tensor Core
+                                 operations can be used.
+        :return: the cudnn math type.
+    """
+    if dtype == dace.float16:
+        return "CUDNN_TENSOR_OP_MATH"
+    if allow_conversion and dtype == dace.float32:
+        return "CUDNN_TENSOR_OP_MATH_ALLOW_CONVERSION"
+    return "CUDNN_DEFAULT_MATH"
+
+
 @op_implementation(op="Conv", name="cuDNN")
 class CudnnConvolution(ONNXForward):
     """ Convolution implementation that uses cuDNN.
@@ -127,9 +147,12 @@ class CudnnConvolution(ONNXForward):
         This node will check for the existence of a _algorithm attribute on the ONNXConv node it is expanding.
         If this attribute does not exist, it will use `CudnnConvolution.default_algorithm`.
 
+        If `CudnnConvolution.allow_tensor_op_conversion` is set, single precision convolutions (and their cuDNN
+        backward passes) are allowed to be down-converted to run on Tensor Cores.
     """
     environments = [environments.cuDNN]
     default_algorithm = "auto"
+    allow_tensor_op_conversion = False
 
     # choices for algorithms
     algorithms = [
@@ -159,8 +182,8 @@ class CudnnConvolution(ONNXForward):
         for name, desc in descs:
             # check that the dtype is supported by cudnn
             if desc.dtype not in [
-                    dace.float32, dace.float64, dace.uint8, dace.int8,
-                    dace.int32
+                    dace.float16, dace.float32, dace.float64, dace.uint8,
+                    dace.int8, dace.int32
             ]:
                 return False
             # only 1d/2d convs for now; ONNX supports N dimensional
@@ -263,7 +286,7 @@ class CudnnConvolution(ONNXForward):
             {_DACE_DTYPE_TO_CUDNN_DTYPE[T]}));
         daceml::cudnn::CheckCudnnError(cudnnSetConvolutionMathType(
             *__state->{unique_id}_conv_desc,
-            CUDNN_DEFAULT_MATH));
+            {_cudnn_conv_math_type(T, CudnnConvolution.allow_tensor_op_conversion)}));
         """
 
         if node.group != 1:
@@ -348,13 +371,7 @@ class CudnnConvolution(ONNXForward):
             *__state->{unique_id}_Y_desc,
             *__state->{unique_id}_algo,
             &ws_size));
-        __state->{unique_id}_workspace_size = new size_t;
-        *__state->{unique_id}_workspace_size = ws_size;
-        cudaMalloc(&__state->{unique_id}_workspace, ws_size);
-        """
-        finalize_code += f"""
-        cudaFree(__state->{unique_id}_workspace);
-        delete __state->{unique_id}_workspace_size;
+        __state->cudnn_workspace->Reserve(ws_size);
         """
 
         tasklet_code = f"""
@@ -370,8 +387,8 @@ class CudnnConvolution(ONNXForward):
             _W,
             *__state->{unique_id}_conv_desc,
             *__state->{unique_id}_algo,
-            __state->{unique_id}_workspace,
-            *__state->{unique_id}_workspace_size,
+            __state->cudnn_workspace->Get(__dace_current_stream),
+            __state->cudnn_workspace->Size(),
             &beta,
             *__state->{unique_id}_Y_desc,
             _Y
@@ -395,9 +412,7 @@ class CudnnConvolution(ONNXForward):
                 f"cudnnTensorDescriptor_t *{unique_id}_Y_desc;",
                 f"cudnnTensorDescriptor_t *{unique_id}_X_desc;",
                 f"cudnnConvolutionFwdAlgo_t *{unique_id}_algo;",
-                f"cudnnFilterDescriptor_t *{unique_id}_W_desc;",
-                f"float *{unique_id}_workspace;",
-                f"size_t *{unique_id}_workspace_size;"
+                f"cudnnFilterDescriptor_t *{unique_id}_W_desc;"
             ])
         nstate.add_edge(inputs["X"], None, tasklet, "_X",
                         nsdfg.make_array_memlet("X"))
@@ -459,18 +474,28 @@ class CudnnBatchNormalizationTraining(ONNXForward):
         if not {"scale", "B"}.issubset(node.in_connectors):
             return False
 
+        # cuDNN derives the descriptor of the parameters from X: they are float32 if X is float16, and have the type of
+        # X otherwise
+        if X.dtype not in [dace.float16, dace.float32, dace.float64]:
+            return False
+        param_dtype = dace.float32 if X.dtype == dace.float16 else X.dtype
+        for name in ["scale", "B", "in_mean", "in_var"]:
+            if in_desc_with_name(node, state, sdfg, name).dtype != param_dtype:
+                return False
+
         return True
 
     @staticmethod
     def forward(node: onnx_op.ONNXOp,
                 state: SDFGState,
                 sdfg: SDFG,
-                reserved_ptr=False) -> Union[nd.Node, SDFG]:
+                reserved_ptr=False,
+                relu=False) -> Union[nd.Node, SDFG]:
 
         nsdfg, nstate, inputs, outputs = empty_sdfg_for_node(sdfg, state, node)
 
-        X_desc = in_desc_with_name(node, state, sdfg, "X")
-        T = X_desc.dtype
+        # if relu is set, a ReLU is applied to the output in the same kernel
+        bn_ops = "CUDNN_BATCHNORM_OPS_BN_ACTIVATION" if relu else "CUDNN_BATCHNORM_OPS_BN"
 
         unique_id = "{}_{}_{}_{}".format(clean_onnx_name(node.name),
                                          sdfg.sdfg_id, sdfg.node_id(state),
@@ -505,6 +530,22 @@ class CudnnBatchNormalizationTraining(ONNXForward):
         delete __state->{unique_id}_scale_desc;
         """
 
+        if relu:
+            init_code += f"""
+            __state->{unique_id}_activation_desc = new cudnnActivationDescriptor_t;
+            daceml::cudnn::CheckCudnnError(cudnnCreateActivationDescriptor(__state->{unique_id}_activation_desc));
+            daceml::cudnn::CheckCudnnError(cudnnSetActivationDescriptor(
+                *__state->{unique_id}_activation_desc,
+                CUDNN_ACTIVATION_RELU,
+                CUDNN_PROPAGATE_NAN,
+                0.0));
+            """
+            finalize_code += f"""
+            daceml::cudnn::CheckCudnnError(cudnnDestroyActivationDescriptor(*__state->{unique_id}_activation_desc));
+            delete __state->{unique_id}_activation_desc;
+            """
+        activation_desc = f"*__state->{unique_id}_activation_desc" if relu else "nullptr"
+
         # setup workspace and reserve space
         init_code += \
             f"""
@@ -514,23 +555,21 @@ class CudnnBatchNormalizationTraining(ONNXForward):
         daceml::cudnn::CheckCudnnError(cudnnGetBatchNormalizationForwardTrainingExWorkspaceSize(
             __dace_cudnn_handle,
             CUDNN_BATCHNORM_SPATIAL,
-            CUDNN_BATCHNORM_OPS_BN,
+            {bn_ops},
             *__state->{unique_id}_X_desc,
             nullptr,
             *__state->{unique_id}_Y_desc,
             *__state->{unique_id}_scale_desc,
-            nullptr,
+            {activation_desc},
             &ws_size));
-        __state->{unique_id}_workspace_size = new size_t;
-        *__state->{unique_id}_workspace_size = ws_size;
-        cudaMalloc(&__state->{unique_id}_workspace, ws_size);
+        __state->cudnn_workspace->Reserve(ws_size);
 
         size_t rs_size;
         daceml::cudnn::CheckCudnnError(cudnnGetBatchNormalizationTrainingExReserveSpaceSize(
             __dace_cudnn_handle,
             CUDNN_BATCHNORM_SPATIAL,
-            CUDNN_BATCHNORM_OPS_BN,
-            nullptr,
+            {bn_ops},
+            {activation_desc},
             *__state->{unique_id}_X_desc,
             &rs_size));
         __state->{unique_id}_reserved_size = new size_t;
@@ -538,10 +577,8 @@ class CudnnBatchNormalizationTraining(ONNXForward):
         cudaMalloc(&__state->{unique_id}_reserved, rs_size);
         """
         finalize_code += f"""
-        cudaFree(__state->{unique_id}_workspace);
         cudaFree(__state->{unique_id}_reserved);
         delete __state->{unique_id}_reserved_size;
-        delete __state->{unique_id}_workspace_size;
         """
 
         tasklet_code = f"""
@@ -551,7 +588,7 @@ class CudnnBatchNormalizationTraining(ONNXForward):
         daceml::cudnn::CheckCudnnError(cudnnBatchNormalizationForwardTrainingEx(
             __dace_cudnn_handle,
             CUDNN_BATCHNORM_SPATIAL,
-            CUDNN_BATCHNORM_OPS_BN,
+            {bn_ops},
             &alpha,
             &beta,
             *__state->{unique_id}_X_desc,
@@ -569,58 +606,58 @@ class CudnnBatchNormalizationTraining(ONNXForward):
             {node.epsilon},
             _saved_mean,
             _saved_var,
-            nullptr,
-            __state->{unique_id}_workspace,
-            *__state->{unique_id}_workspace_size,
+            {activation_desc},
+            __state->cudnn_workspace->Get(__dace_current_stream),
+            __state->cudnn_workspace->Size(),
             __state->{unique_id}_reserved,
             *__state->{unique_id}_reserved_size));
 
             // save the reserved ptr as an output if required
             {f"_reserved_ptr = __state->{unique_id}_reserved;" if reserved_ptr else ""}
-            {f"_reserved_size = *__state->{unique_id}_reserved_size;" if reserved_ptr else ""}
         """
 
         in_connectors = ["X", "B", "scale", "in_mean", "in_var"]
         out_connectors = {
-            "Y": dace.pointer(T),
-            "saved_mean": dace.pointer(T),
-            "saved_var": dace.pointer(T)
+            i: dace.pointer(outputs[i].desc(nsdfg).dtype)
+            for i in ["Y", "saved_mean", "saved_var"]
         }
         if reserved_ptr:
-            out_connectors["reserved_size"] = dace.int64
+            # the size of the reserved space is recomputed by the consumer, so only the pointer is an output
             out_connectors["reserved_ptr"] = dace.pointer(dace.typeclass(None))
             nsdfg.add_scalar(f"reserved_ptr",
                              dace.pointer(dace.typeclass(None)),
                              storage=dtypes.StorageType.CPU_Heap,
                              transient=True)
-            nsdfg.add_scalar(f"reserved_size",
-                             dace.int64,
-                             storage=dtypes.StorageType.CPU_Heap,
-                             transient=True)
             outputs["reserved_ptr"] = nstate.add_write("reserved_ptr")
-            outputs["reserved_size"] = nstate.add_write("reserved_size")
+
+        state_fields = [
+            f"cudnnTensorDescriptor_t *{unique_id}_Y_desc;",
+            f"cudnnTensorDescriptor_t *{unique_id}_X_desc;",
+            f"cudnnTensorDescriptor_t *{unique_id}_scale_desc;",
+            f"float *{unique_id}_reserved;",
+            f"size_t *{unique_id}_reserved_size;"
+        ]
+        if relu:
+            state_fields.append(
+                f"cudnnActivationDescriptor_t *{unique_id}_activation_desc;")
 
         init_code = "{\n" + init_code + "\n}"
         finalize_code = "{\n" + finalize_code + "\n}"
 
+        in_connector_types = {
+            f"_{i}": dace.pointer(inputs[i].desc(nsdfg).dtype)
+            for i in in_connectors
+        }
         tasklet = nstate.add_tasklet(
-            unique_id, {f"_{i}": dace.pointer(T)
-                        for i in in_connectors},
+            unique_id,
+            in_connector_types,
             {f"_{i}": t
              for i, t in out_connectors.items()},
             tasklet_code,
             dtypes.Language.CPP,
             code_init=init_code,
             code_exit=finalize_code,
-            state_fields=[
-                f"cudnnTensorDescriptor_t *{unique_id}_Y_desc;",
-                f"cudnnTensorDescriptor_t *{unique_id}_X_desc;",
-                f"cudnnTensorDescriptor_t *{unique_id}_scale_desc;",
-                f"float *{unique_id}_workspace;",
-                f"size_t *{unique_id}_workspace_size;"
-                f"float *{unique_id}_reserved;",
-                f"size_t *{unique_id}_reserved_size;"
-            ])
+            state_fields=state_fields)
 
         for inp in in_connectors:
             nstate.add_edge(inputs[inp], None, tasklet, f"_{inp}",
@@ -12,6 +12,7 @@ from dace.transformation.interstate import StateFusion
 
 import daceml.onnx as donnx
 from daceml.autodiff import AutoDiffException, add_backward_pass
+from daceml.autodiff.backward_pass_generator import BackwardPassGenerator
 
 ##################################
 # Testing utilities
@@ -767,3 +768,43 @@ def test_reshape_reuse_in_same_state():
         torch_func,
         dict(inp=np.random.rand(9).astype(np.float64), ),
     )
+
+
+def test_global_average_pool_float4(sdfg_name):
+    # only the generated backward is inspected, so the GPU arrays are never allocated
+    sdfg = dace.SDFG(sdfg_name)
+    sdfg.add_array("X", [2, 3, 4, 4],
+                   dace.float32,
+                   storage=dace.StorageType.GPU_Global)
+    sdfg.add_array("Y", [2, 3, 1, 1],
+                   dace.float32,
+                   storage=dace.StorageType.GPU_Global)
+
+    state = sdfg.add_state()
+    op_node = donnx.ONNXGlobalAveragePool("GlobalAveragePool")
+    state.add_node(op_node)
+    state.add_edge(state.add_access("X"), None, op_node, "X",
+                   sdfg.make_array_memlet("X"))
+    state.add_edge(op_node, "Y", state.add_access("Y"), None,
+                   sdfg.make_array_memlet("Y"))
+
+    backward_sdfg = dace.SDFG(sdfg_name + "_backward")
+    gen = BackwardPassGenerator(sdfg=sdfg,
+                                state=state,
+                                given_gradients=["Y"],
+                                required_gradients=["X"],
+                                backward_sdfg=backward_sdfg,
+                                backward_state=backward_sdfg.add_state(),
+                                zero_non_transients=False)
+    gen.backward()
+
+    gap_backward = next(n for n, _ in backward_sdfg.all_nodes_recursive()
+                        if isinstance(n, nd.NestedSDFG))
+    tasklet = next(n for n, _ in gap_backward.sdfg.all_nodes_recursive()
+                   if isinstance(n, nd.Tasklet))
+    assert "float4" in tasklet.code.as_string
+
+    # each thread writes exactly four elements of the flattened gradient
+    assert tuple(gap_backward.sdfg.arrays["X_grad"].shape) == (2, 3, 16)
+    write = gap_backward.sdfg.nodes()[0].out_edges(tasklet)[0].data
+    assert write.subset.num_elements() == 4
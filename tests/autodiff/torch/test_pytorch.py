@@ -1,11 +1,17 @@
+import copy
+
 import numpy as np
 import pytest
 
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
+from dace.sdfg import nodes
 from dace.transformation.dataflow import MapFusion
 
+import daceml.onnx as donnx
+from daceml.autodiff.implementations.onnx_ops import DefaultSoftmaxBackward, DefaultLogSoftmaxBackward, \
+    PureGlobalAveragePoolingBackward, CuDNNConvBackward, CuDNNConvTransposeBackward, CuDNNBatchNormBackward
 from daceml.torch import DaceModule
 from daceml.testing import torch_tensors_close, copy_to_gpu
 from daceml.util import utils
@@ -21,6 +27,7 @@ def run_pytorch_module(
     rtol=1e-4,
     atol=1e-3,
     post_onnx_hooks=None,
+    post_autodiff_hooks=None,
 ):
     shape = shape or (3, 5)
 
@@ -60,6 +67,9 @@ def run_pytorch_module(
     if post_onnx_hooks is not None:
         for i, h in enumerate(post_onnx_hooks):
             dace_module.append_post_onnx_hook(str(i), h)
+    if post_autodiff_hooks is not None:
+        for i, h in enumerate(post_autodiff_hooks):
+            dace_module.append_post_autodiff_hook(str(i), h)
 
     if use_max:
         dace_s = dace_module(dace_input).max()
@@ -93,7 +103,10 @@ def test_repeated(sdfg_name, gpu):
     run_pytorch_module(Module(), sdfg_name, gpu)
 
 
-def test_softmax(sdfg_name, gpu):
+@pytest.mark.parametrize("recompute", [False, True])
+def test_softmax(sdfg_name, gpu, recompute, monkeypatch):
+    monkeypatch.setattr(DefaultSoftmaxBackward, "recompute", recompute)
+
     class Module(torch.nn.Module):
         def forward(self, x):
             x = F.softmax(x, dim=1)
@@ -102,6 +115,206 @@ def test_softmax(sdfg_name, gpu):
     run_pytorch_module(Module(), sdfg_name, gpu, use_max=True)
 
 
+@pytest.mark.parametrize("recompute", [False, True])
+def test_logsoftmax(sdfg_name, gpu, recompute, monkeypatch):
+    monkeypatch.setattr(DefaultLogSoftmaxBackward, "recompute", recompute)
+
+    class Module(torch.nn.Module):
+        def forward(self, x):
+            x = F.log_softmax(x, dim=1)
+            return x
+
+    run_pytorch_module(Module(), sdfg_name, gpu, use_max=True)
+
+
+@pytest.mark.parametrize("fuse_relu", [False, True])
+def test_global_average_pool_relu(sdfg_name, gpu, fuse_relu, monkeypatch):
+    monkeypatch.setattr(PureGlobalAveragePoolingBackward, "fuse_relu",
+                        fuse_relu)
+
+    class Module(torch.nn.Module):
+        def forward(self, x):
+            x = F.relu(x - 0.5)
+            return F.adaptive_avg_pool2d(x, 1)
+
+    labels = {}
+
+    def find_labels(module: DaceModule):
+        for node, _ in module.sdfg.all_nodes_recursive():
+            if isinstance(node, donnx.ONNXRelu):
+                labels["relu"] = node.label
+            elif isinstance(node, donnx.ONNXGlobalAveragePool):
+                labels["gap"] = node.label
+
+    def check_fused(forward_sdfg, backward_sdfg):
+        backward_nodes = {
+            n.sdfg.name: n
+            for n, _ in backward_sdfg.all_nodes_recursive()
+            if isinstance(n, nodes.NestedSDFG)
+        }
+        assert labels["relu"] + "_backward_expansion" not in backward_nodes
+        gap_backward = backward_nodes[labels["gap"] + "_backward_expansion"]
+        # the fused backward masks the gradient with the output of the ReLU
+        assert ("X" in gap_backward.in_connectors) == fuse_relu
+
+    run_pytorch_module(Module(),
+                       sdfg_name,
+                       gpu,
+                       shape=(2, 3, 4, 5),
+                       post_onnx_hooks=[find_labels],
+                       post_autodiff_hooks=[check_fused])
+
+
+def test_global_average_pool_fill(sdfg_name, gpu, monkeypatch):
+    # use std::fill_n for the broadcast on the CPU
+    monkeypatch.setattr(PureGlobalAveragePoolingBackward, "fill_threshold", 1)
+
+    class Module(torch.nn.Module):
+        def forward(self, x):
+            return F.adaptive_avg_pool2d(torch.log(x), 1)
+
+    run_pytorch_module(Module(), sdfg_name, gpu, shape=(2, 3, 4, 5))
+
+
+@pytest.mark.gpu
+@pytest.mark.parametrize("log", [False, True])
+def test_softmax_cudnn(sdfg_name, log):
+    class Module(torch.nn.Module):
+        def forward(self, x):
+            if log:
+                return F.log_softmax(x, dim=1)
+            return F.softmax(x, dim=1)
+
+    def use_cudnn(module: DaceModule):
+        for node, _ in module.sdfg.all_nodes_recursive():
+            if isinstance(node, (donnx.ONNXSoftmax, donnx.ONNXLogSoftmax)):
+                node.backward_implementation = "cuDNN"
+
+    run_pytorch_module(Module(),
+                       sdfg_name,
+                       True,
+                       shape=(3, 5, 4),
+                       use_max=True,
+                       post_onnx_hooks=[use_cudnn])
+
+
+@pytest.mark.gpu
+@pytest.mark.parametrize("op", ["Conv", "ConvTranspose", "BatchNormalization"])
+def test_cudnn_cuda_graph(sdfg_name, op, monkeypatch):
+    module, node_type, backward_impl = {
+        "Conv": (nn.Conv2d(4, 8, 3), donnx.ONNXConv, CuDNNConvBackward),
+        "ConvTranspose": (nn.ConvTranspose2d(4, 8, 3), donnx.ONNXConvTranspose,
+                          CuDNNConvTransposeBackward),
+        "BatchNormalization": (nn.BatchNorm2d(4), donnx.ONNXBatchNormalization,
+                               CuDNNBatchNormBackward),
+    }[op]
+    monkeypatch.setattr(backward_impl, "use_cuda_graph", True)
+
+    torch_module = module.cuda()
+    dace_module = DaceModule(copy.deepcopy(torch_module),
+                             backward=True,
+                             training=True,
+                             sdfg_name=sdfg_name)
+
+    def use_cudnn(module: DaceModule):
+        for node, _ in module.sdfg.all_nodes_recursive():
+            if isinstance(node, node_type):
+                if op != "ConvTranspose":
+                    node.implementation = "cuDNN"
+                node.backward_implementation = "cuDNN"
+
+    dace_module.append_post_onnx_hook("use_cudnn", use_cudnn)
+
+    # the second call replays the captured graph
+    for _ in range(2):
+        torch_input = torch.rand(2, 4, 8, 8).cuda()
+        dace_input = torch.clone(torch_input)
+        torch_input.requires_grad = True
+        dace_input.requires_grad = True
+
+        torch_output = torch_module(torch_input)
+        dy = torch.rand_like(torch_output)
+        torch_output.backward(dy)
+        dace_module(dace_input).backward(dy)
+
+        torch_tensors_close("grad", torch_input.grad, dace_input.grad)
+
+
+@pytest.mark.gpu
+def test_bn_relu_fusion_cudnn(sdfg_name, monkeypatch):
+    monkeypatch.setattr(CuDNNBatchNormBackward, "fuse_relu", True)
+
+    class Module(torch.nn.Module):
+        def __init__(self):
+            super(Module, self).__init__()
+            self.conv = nn.Conv2d(8, 8, 3, padding=1).half()
+            # cuDNN requires single precision parameters for half precision inputs
+            self.bn = nn.BatchNorm2d(8)
+
+        def forward(self, x):
+            return F.relu(self.bn(self.conv(x)))
+
+    torch_module = Module().cuda()
+    dace_module = DaceModule(copy.deepcopy(torch_module),
+                             backward=True,
+                             training=True,
+                             sdfg_name=sdfg_name)
+
+    relu_labels = []
+
+    def use_cudnn_nhwc(module: DaceModule):
+        for node, _ in module.sdfg.all_nodes_recursive():
+            if isinstance(node,
+                          (donnx.ONNXConv, donnx.ONNXBatchNormalization)):
+                node.implementation = "cuDNN"
+            elif isinstance(node, donnx.ONNXRelu):
+                relu_labels.append(node.label)
+
+        # store the intermediate tensors channels-last
+        for desc in module.sdfg.arrays.values():
+            if desc.transient and len(desc.shape) == 4:
+                N, C, H, W = desc.shape
+                desc.strides = (C * H * W, 1, W * C, C)
+
+    def check_fused(forward_sdfg, backward_sdfg):
+        assert len(relu_labels) == 1
+        relu_backward = relu_labels[0] + "_backward_expansion"
+        bwd_nodes = [n for n, _ in backward_sdfg.all_nodes_recursive()]
+        assert not any(
+            isinstance(n, nodes.NestedSDFG) and n.sdfg.name == relu_backward
+            for n in bwd_nodes)
+        assert any(
+            isinstance(n, nodes.Tasklet) and "reserved_ptr" in n.in_connectors
+            and "Y" in n.in_connectors for n in bwd_nodes)
+
+    dace_module.append_post_onnx_hook("use_cudnn_nhwc", use_cudnn_nhwc)
+    dace_module.append_post_autodiff_hook("check_fused", check_fused)
+
+    torch_input = torch.rand(2, 8, 6, 6).cuda().half()
+    dace_input = torch.clone(torch_input)
+    torch_input.requires_grad = True
+    dace_input.requires_grad = True
+
+    torch_output = torch_module(torch_input)
+    dy = torch.rand_like(torch_output)
+    torch_output.backward(dy)
+    dace_module(dace_input).backward(dy)
+
+    torch_tensors_close("grad",
+                        torch_input.grad,
+                        dace_input.grad,
+                        rtol=1e-2,
+                        atol=1e-2)
+    for (name, torch_param), (_, dace_param) in zip(
+            torch_module.named_parameters(),
+            dace_module.model.named_parameters()):
+        torch_tensors_close(name,
+                            torch_param.grad,
+                            dace_param.grad,
+                            rtol=1e-2,
+                            atol=1e-2)
+
+
 def test_reshape_on_memlet_path(sdfg_name, gpu):
     # required test: this function in a nn.Module, with apply simplify so that the reshape is
     # inlined and copy is removed
@@ -259,3 +472,33 @@ def test_simple_broadcasted_mul(sdfg_name, gpu):
             return x * y
 
     run_pytorch_module(Module(), sdfg_name, gpu)
+
+
+def test_einsum_chain(sdfg_name, gpu):
+    class Module(torch.nn.Module):
+        def __init__(self):
+            super(Module, self).__init__()
+            self.fc1 = nn.Parameter(torch.rand(5, 4))
+            self.fc2 = nn.Parameter(torch.rand(4, 6))
+
+        def forward(self, x):
+            return torch.einsum("bi,ij,jk->bk", x, self.fc1, self.fc2)
+
+    run_pytorch_module(Module(), sdfg_name, gpu, use_max=False)
+
+
+def test_einsum_interleaved(sdfg_name, gpu):
+    # the batch indices of the weight are not adjacent, so the gradients require transposes
+    class Module(torch.nn.Module):
+        def __init__(self):
+            super(Module, self).__init__()
+            self.w = nn.Parameter(torch.rand(2, 6, 3, 5))
+
+        def forward(self, x):
+            return torch.einsum("bhqd,bkhd->bhqk", x, self.w)
+
+    run_pytorch_module(Module(),
+                       sdfg_name,
+                       gpu,
+                       shape=(2, 3, 4, 5),
+                       use_max=False)